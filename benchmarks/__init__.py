@@ -0,0 +1 @@
+# Benchmarks de los pipelines de datos del dashboard sobre datasets sintéticos.
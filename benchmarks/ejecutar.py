@@ -0,0 +1,214 @@
+"""Benchmark de los pipelines de datos de cada página sobre datasets sintéticos.
+
+    python -m benchmarks.ejecutar                      # 10k y 1M, compara con la línea base
+    python -m benchmarks.ejecutar --escalas 10k 1M 10M
+    python -m benchmarks.ejecutar --guardar            # actualiza benchmarks/linea_base.json
+
+Cada escala corre en un proceso aparte apuntando DATOS_PARTICIONADOS a su almacén
+sintético, con las cachés de Streamlit vaciadas antes de cada repetición (todas las
+mediciones son en frío). BACKEND_CONSULTAS se respeta, así que se pueden comparar
+los backends pandas y DuckDB. El comando termina con código 1 si alguna etapa supera
+la línea base en más de la tolerancia.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.sintetico import ESCALAS
+from comun.kpis import MEDIDAS_KPI
+
+DIR_BENCHMARKS = Path(__file__).resolve().parent
+DIR_DATOS = DIR_BENCHMARKS / "datos"
+RUTA_LINEA_BASE = DIR_BENCHMARKS / "linea_base.json"
+
+TOTAL = (("total", "total", "sum"),)
+SANKEYS = (
+    ("pais", "categoria", "total"),
+    ("categoria", "producto", "total"),
+    ("ciudad", "categoria", "total"),
+    ("mes", "producto", "utilidad"),
+    ("pais", "producto", "utilidad"),
+    ("pais", "categoria", "utilidad"),
+)
+
+
+# ---------------- etapas (se ejecutan dentro del proceso de cada escala) ----------------
+def _carga(ctx):
+    from comun.datos import cargar_ventas
+
+    ctx["filas"] = len(cargar_ventas())
+
+
+def _filtros(ctx):
+    from comun.consultas import valores_distintos
+    from comun.datos import cargar_ventas, filtros_ventas
+
+    paises = valores_distintos("pais")
+    ctx["anio"], ctx["mes"] = valores_distintos("anio")[0], max(valores_distintos("mes"))
+    ctx["filtros"] = filtros_ventas(anio=ctx["anio"], mes_hasta=ctx["mes"], paises=paises[:3])
+    ctx["paises"] = paises
+    cargar_ventas(filtros=ctx["filtros"])
+
+
+def _kpis(ctx):
+    from comun.consultas import agregar
+    from comun.kpis import COMPARACIONES, kpis_comparados, variacion_categorias
+
+    filtros, mes = ctx["filtros"], ctx["mes"]
+    mes_actual = filtros + (("mes", "==", mes),)
+    for modo in COMPARACIONES:
+        kpis_comparados(ctx["anio"], mes, modo)
+        variacion_categorias(ctx["anio"], mes, modo)
+    agregar(["mes"], TOTAL, filtros)
+    agregar(["pais"], TOTAL, mes_actual)
+    agregar(["mes", "categoria"], TOTAL, filtros)
+    agregar(["categoria"], TOTAL, mes_actual)
+    ctx["resumen"] = agregar(["pais", "categoria"], MEDIDAS_KPI[:1] + MEDIDAS_KPI[2:], mes_actual)
+
+
+def _sankey(ctx):
+    from comun.paleta import mapa_colores
+    from comun.sankey import figura_sankey, podar_enlaces, tabla_sankey
+
+    for origen, destino, valor in SANKEYS:
+        tabla = tabla_sankey(origen, destino, valor)
+        if origen in ("ciudad", "pais"):
+            tabla = podar_enlaces(tabla, origen, destino, valor, top_n=5)
+        tabla[origen] = tabla[origen].astype(str)
+        colores = mapa_colores(tabla[origen].unique(), origen)
+        figura_sankey(tabla, origen, destino, valor, colores, f"{origen} → {destino}").to_json()
+
+
+def _paneles(ctx):
+    from comun.pronosticos import serie_mensual, series_agrupadas
+
+    for pais in ctx["paises"]:
+        serie_mensual(pais, "pais")
+    series_agrupadas("pais", "fecha")
+    series_agrupadas("categoria", "fecha")
+
+
+def _exportacion(ctx):
+    from comun.exportar import exportar_tabla
+    from comun.sankey import tabla_sankey
+
+    for formato in ("xlsx", "csv", "parquet"):
+        exportar_tabla(tabla_sankey("pais", "producto", "utilidad"), formato)
+
+
+def _pdf(ctx):
+    # Solo la parte tabular del informe: rasterizar los gráficos requiere kaleido/Chrome
+    import io
+
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", "", 10)
+    for _, row in ctx["resumen"].iterrows():
+        pdf.cell(0, 8, f"{row['pais']} - {row['categoria']} | Cantidad: {row['cantidad']} | Total: ${row['total']:.2f} | Utilidad: ${row['utilidad']:.2f}", ln=True)
+    pdf.output(io.BytesIO())
+
+
+ETAPAS = (
+    ("carga", _carga),
+    ("filtros", _filtros),
+    ("kpis", _kpis),
+    ("sankey", _sankey),
+    ("paneles", _paneles),
+    ("exportacion", _exportacion),
+    ("pdf", _pdf),
+)
+
+
+def medir_escala(repeticiones):
+    import streamlit as st
+
+    from comun.cache import CACHE
+
+    tiempos = {etapa: [] for etapa, _ in ETAPAS}
+    ctx = {}
+    for _ in range(repeticiones):
+        # Cada repetición arranca en frío: cachés de Streamlit y caché de resultados compartida
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        CACHE.vaciar()
+        for etapa, funcion in ETAPAS:
+            inicio = time.perf_counter()
+            funcion(ctx)
+            tiempos[etapa].append(time.perf_counter() - inicio)
+    return {
+        etapa: {"segundos": statistics.median(valores), "filas_por_segundo": ctx["filas"] / statistics.median(valores)}
+        for etapa, valores in tiempos.items()
+    }
+
+
+# ---------------- orquestación ----------------
+def ejecutar_escala(escala, repeticiones, semilla):
+    from benchmarks.sintetico import preparar_almacen
+
+    almacen = DIR_DATOS / escala
+    inicio = time.perf_counter()
+    preparar_almacen(almacen, ESCALAS[escala], semilla)
+    print(f"[{escala}] almacén listo en {time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+
+    entorno = {**os.environ, "DATOS_PARTICIONADOS": str(almacen), "PERFILAR": "0"}
+    proceso = subprocess.run(
+        [sys.executable, "-m", "benchmarks.ejecutar", "--interno", "--repeticiones", str(repeticiones)],
+        cwd=DIR_BENCHMARKS.parent, env=entorno, capture_output=True, text=True,
+    )
+    if proceso.returncode != 0:
+        sys.stderr.write(proceso.stderr)
+        raise SystemExit(f"[{escala}] el benchmark falló")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def comparar(resultados, linea_base, tolerancia):
+    regresiones = []
+    print(f"{'escala':<6} {'etapa':<12} {'segundos':>10} {'filas/s':>14} {'base':>10} {'Δ':>8}")
+    for escala, etapas in resultados.items():
+        for etapa, medida in etapas.items():
+            base = linea_base.get(escala, {}).get(etapa, {}).get("segundos")
+            delta = (medida["segundos"] / base - 1) if base else None
+            print(f"{escala:<6} {etapa:<12} {medida['segundos']:>10.4f} {medida['filas_por_segundo']:>14,.0f} "
+                  f"{base if base is not None else '-':>10} {f'{delta:+.0%}' if delta is not None else '-':>8}")
+            if delta is not None and delta > tolerancia:
+                regresiones.append((escala, etapa, delta))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los pipelines del dashboard sobre datos sintéticos.")
+    parser.add_argument("--escalas", nargs="+", choices=list(ESCALAS), default=["10k", "1M"])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Aumento relativo permitido sobre la línea base")
+    parser.add_argument("--guardar", action="store_true", help="Guarda los resultados como nueva línea base")
+    parser.add_argument("--interno", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        print(json.dumps(medir_escala(args.repeticiones)))
+        return
+
+    resultados = {escala: ejecutar_escala(escala, args.repeticiones, args.semilla) for escala in args.escalas}
+    linea_base = json.loads(RUTA_LINEA_BASE.read_text()) if RUTA_LINEA_BASE.exists() else {}
+    regresiones = comparar(resultados, linea_base, args.tolerancia)
+
+    if args.guardar:
+        RUTA_LINEA_BASE.write_text(json.dumps({**linea_base, **resultados}, indent=2) + "\n")
+        print(f"Línea base actualizada en {RUTA_LINEA_BASE}")
+    elif regresiones:
+        for escala, etapa, delta in regresiones:
+            print(f"REGRESIÓN [{escala}] {etapa}: {delta:+.0%} sobre la línea base", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Generador de ventas sintéticas con el esquema y las distribuciones de db-datos-sintetico.xlsx.
+
+Las combinaciones país/ciudad y categoría/producto (con su precio y % de utilidad),
+las cantidades y los días se muestrean con las frecuencias observadas en el Excel
+modelo; total y utilidad se recalculan igual que en los datos reales.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from comun.datos import RAIZ
+
+RUTA_MODELO = RAIZ / "datos" / "db-datos-sintetico.xlsx"
+ESCALAS = {"10k": 10_000, "1M": 1_000_000, "10M": 10_000_000}
+
+
+def _frecuencias(df, columnas):
+    conteo = df.groupby(columnas, observed=True).size()
+    return conteo.index.to_frame(index=False), (conteo / conteo.sum()).to_numpy()
+
+
+def generar(filas, semilla=0, ruta_modelo=RUTA_MODELO):
+    """DataFrame de `filas` ventas sintéticas, ordenado por fecha."""
+    modelo = pd.read_excel(ruta_modelo, sheet_name=0, parse_dates=["fecha"]).dropna(subset=["fecha", "total"])
+    rng = np.random.default_rng(semilla)
+
+    lugares, p_lugares = _frecuencias(modelo, ["pais", "ciudad"])
+    productos, p_productos = _frecuencias(modelo, ["categoria", "producto", "precio", "util_porcent"])
+    cantidades, p_cantidades = _frecuencias(modelo, ["cantidad"])
+    dias, p_dias = _frecuencias(modelo, ["fecha"])
+
+    i_lugar = rng.choice(len(lugares), filas, p=p_lugares)
+    i_producto = rng.choice(len(productos), filas, p=p_productos)
+    fecha = np.sort(dias["fecha"].to_numpy()[rng.choice(len(dias), filas, p=p_dias)])
+    cantidad = cantidades["cantidad"].to_numpy()[rng.choice(len(cantidades), filas, p=p_cantidades)]
+
+    def categorica(tabla, columna, indices):
+        categorias = pd.unique(tabla[columna])
+        codigos = pd.Index(categorias).get_indexer(tabla[columna])
+        return pd.Categorical.from_codes(codigos[indices], categories=categorias)
+
+    fechas = pd.DatetimeIndex(fecha)
+    precio = productos["precio"].to_numpy()[i_producto]
+    util_porcent = productos["util_porcent"].to_numpy()[i_producto]
+    total = precio * cantidad
+    df = pd.DataFrame({
+        "orden": np.arange(1, filas + 1),
+        "anio": fechas.year.to_numpy(),
+        "mes": fechas.month.to_numpy(),
+        "dia": fechas.day.to_numpy(),
+        "fecha": fechas,
+        "pais": categorica(lugares, "pais", i_lugar),
+        "ciudad": categorica(lugares, "ciudad", i_lugar),
+        "categoria": categorica(productos, "categoria", i_producto),
+        "producto": categorica(productos, "producto", i_producto),
+        "precio": precio,
+        "util_porcent": util_porcent,
+        "cantidad": cantidad,
+        "total": total,
+        "utilidad": (total * util_porcent).round(2),
+    })
+    # Las columnas de texto quedan como str, igual que al leer el Excel
+    return df.astype({c: str for c in ["pais", "ciudad", "categoria", "producto"]})
+
+
+def preparar_almacen(destino, filas, semilla=0):
+    """Genera (si no existe ya) el almacén particionado sintético de `filas` filas."""
+    from comun.datos import MARCA_VERSION, crear_particiones
+
+    destino = Path(destino)
+    version = f"sintetico-{filas}-{semilla}"
+    marca = destino / MARCA_VERSION
+    if marca.exists() and marca.read_text() == version:
+        return destino
+    return crear_particiones(destino, generar(filas, semilla), version)
@@ -0,0 +1 @@
+# Código compartido entre las páginas del dashboard.
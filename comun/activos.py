@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from PIL import Image
+
+RAIZ = Path(__file__).resolve().parent.parent
+# Streamlit sirve el contenido de static/ en app/static/ cuando enableStaticServing está activo
+DIR_ESTATICO = RAIZ / "static" / "img"
+URL_ESTATICA = "app/static/img"
+
+# Formatos en orden de preferencia; AVIF solo se genera si Pillow lo soporta
+FORMATOS = (
+    ("avif", "AVIF", "image/avif", {"quality": 50}),
+    ("webp", "WEBP", "image/webp", {"quality": 75, "method": 6}),
+    ("jpg", "JPEG", "image/jpeg", {"quality": 80, "optimize": True, "progressive": True}),
+)
+
+
+def generar_variantes(origen, ancho):
+    """Genera versiones redimensionadas y recomprimidas de una imagen en static/img.
+
+    Devuelve una lista de pares (url, tipo mime) ordenada por preferencia. Las
+    variantes ya generadas se reutilizan mientras la imagen original no cambie, y
+    la url incluye la fecha de modificación para invalidar la caché del navegador.
+    """
+    origen = RAIZ / origen
+    version = int(origen.stat().st_mtime)
+    DIR_ESTATICO.mkdir(parents=True, exist_ok=True)
+
+    imagen = None
+    variantes = []
+    for extension, formato, mime, opciones in FORMATOS:
+        destino = DIR_ESTATICO / f"{origen.stem}-{ancho}.{extension}"
+        if not destino.exists() or destino.stat().st_mtime < origen.stat().st_mtime:
+            if imagen is None:
+                imagen = Image.open(origen).convert("RGB")
+                imagen.thumbnail((ancho, ancho * 4))
+            try:
+                imagen.save(destino, format=formato, **opciones)
+            except (KeyError, OSError, ValueError):
+                destino.unlink(missing_ok=True)
+                continue
+        variantes.append((f"{URL_ESTATICA}/{destino.name}?v={version}", mime))
+    return variantes
+
+
+def css_fondo(variantes, selector=".stApp"):
+    """Regla CSS de fondo con image-set() y la última variante (JPEG) como respaldo."""
+    respaldo = variantes[-1][0]
+    opciones = ", ".join(f'url("{url}") type("{mime}")' for url, mime in variantes)
+    return (
+        f"{selector}{{background-image: url(\"{respaldo}\");"
+        f"background-image: image-set({opciones});}}"
+    )
+
+
+def html_picture(variantes, alt=""):
+    """Elemento <picture> que deja al navegador elegir el formato soportado."""
+    fuentes = "".join(f'<source srcset="{url}" type="{mime}">' for url, mime in variantes[:-1])
+    return f'<picture>{fuentes}<img src="{variantes[-1][0]}" alt="{alt}" style="width:100%"></picture>'
@@ -0,0 +1,246 @@
+"""API HTTP local con los mismos KPIs, tablas Sankey y pronósticos que las páginas.
+
+    python -m comun.api [--host 127.0.0.1] [--port 8600]
+
+Rutas (todas GET):
+    /kpis?anio=2024&mes=5&pais=Chile&comparacion=interanual   KPIs del período y de la referencia
+    /sankey/{origen}/{destino}?valor=total&pais=...  tabla origen → destino
+    /pronosticos/mensual?columna=pais&entidad=Chile&horizonte=3
+    /pronosticos/nbeats?columna=pais&entidad=Chile&grupo=mes&horizonte=3
+    /transacciones?desde=2023-01-01&hasta=2024-12-31&pais=Chile&formato=csv
+
+Las respuestas son JSON (lista de registros) o Arrow IPC stream con `?formato=arrow` o
+`Accept: application/vnd.apache.arrow.stream`. El ETag depende de la ruta, los
+parámetros y la versión de los datos, así que un `If-None-Match` vigente responde 304
+sin calcular nada. Los cálculos corren en un pool de hilos (API_TRABAJADORES) para no
+bloquear el event loop, y las respuestas grandes se comprimen con gzip.
+
+/transacciones devuelve las filas crudas como CSV o Parquet por streaming: se leen y
+escriben por lotes (EXPORTACION_FILAS_POR_LOTE), sin armar el archivo en memoria.
+"""
+import asyncio
+import hashlib
+import os
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import parse_qs
+
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from comun.consultas import esquema_filas, lotes_filas, valores_distintos, version_fuente
+from comun.datos import filtros_transacciones
+from comun.exportar import FORMATOS, trozos_exportacion
+from comun.kpis import COMPARACIONES, kpis_comparados
+from comun.pronosticos import (FRECUENCIAS, HORIZONTES, entrenar_mensual, entrenar_nbeats, leer_mensual,
+                               leer_nbeats, serie_mensual, series_agrupadas)
+from comun.sankey import tabla_sankey
+
+TIPO_ARROW = "application/vnd.apache.arrow.stream"
+DIMENSIONES = ("pais", "ciudad", "categoria", "producto", "mes")
+# Columnas enteras: sus filtros se convierten antes de compararse con los datos
+DIMENSIONES_ENTERAS = ("mes",)
+VALORES = ("total", "utilidad", "cantidad")
+COLUMNAS_PRONOSTICO = ("pais", "categoria")
+
+POOL = ThreadPoolExecutor(int(os.environ.get("API_TRABAJADORES", os.cpu_count() or 4)), thread_name_prefix="api")
+
+
+async def en_pool(funcion, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(POOL, partial(funcion, *args, **kwargs))
+
+
+def _formato(request):
+    formato = request.query_params.get("formato")
+    if formato is None:
+        formato = "arrow" if TIPO_ARROW in request.headers.get("accept", "") else "json"
+    if formato not in ("arrow", "json"):
+        raise HTTPException(400, "formato debe ser 'arrow' o 'json'")
+    return formato
+
+
+def _etag(request, formato):
+    firma = repr((request.url.path, sorted(request.query_params.multi_items()), formato, version_fuente()))
+    return f'"{hashlib.sha1(firma.encode()).hexdigest()}"'
+
+
+def _serializar(df, formato):
+    if formato == "json":
+        return df.to_json(orient="records", date_format="iso", force_ascii=False).encode(), "application/json"
+    import pyarrow as pa
+
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    destino = pa.BufferOutputStream()
+    with pa.ipc.new_stream(destino, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return destino.getvalue().to_pybytes(), TIPO_ARROW
+
+
+def recurso(calcular):
+    """Convierte `calcular(request) -> DataFrame` en un handler con ETag, formato y pool."""
+    async def handler(request):
+        formato = _formato(request)
+        etag = _etag(request, formato)
+        cabeceras = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cabeceras)
+        df = await en_pool(calcular, request)
+        cuerpo, tipo = await en_pool(_serializar, df, formato)
+        return Response(cuerpo, media_type=tipo, headers=cabeceras)
+    return handler
+
+
+def _entero(request, nombre, obligatorio=False):
+    valor = request.query_params.get(nombre)
+    if valor is None:
+        if obligatorio:
+            raise HTTPException(400, f"Falta el parámetro {nombre}")
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise HTTPException(400, f"{nombre} debe ser un entero")
+
+
+def _fecha(request, nombre):
+    try:
+        return date.fromisoformat(request.query_params[nombre])
+    except KeyError:
+        raise HTTPException(400, f"Falta el parámetro {nombre}")
+    except ValueError:
+        raise HTTPException(400, f"{nombre} debe ser una fecha AAAA-MM-DD")
+
+
+def _valores(request, columna):
+    valores = request.query_params.getlist(columna)
+    if columna not in DIMENSIONES_ENTERAS:
+        return tuple(valores)
+    try:
+        return tuple(int(valor) for valor in valores)
+    except ValueError:
+        raise HTTPException(400, f"{columna} debe ser un entero")
+
+
+def _elegir(valor, opciones, nombre):
+    if valor not in opciones:
+        raise HTTPException(400, f"{nombre} debe ser uno de: {', '.join(map(str, opciones))}")
+    return valor
+
+
+# ---------------- recursos ----------------
+def kpis(request):
+    anio = _entero(request, "anio") or valores_distintos("anio")[0]
+    mes = _entero(request, "mes") or valores_distintos("mes")[0]
+    modo = _elegir(request.query_params.get("comparacion", "mes_anterior"), tuple(COMPARACIONES), "comparacion")
+    df = kpis_comparados(anio, mes, modo, tuple(request.query_params.getlist("pais")))
+    return df.rename_axis("periodo").reset_index()
+
+
+def sankey(request):
+    origen = _elegir(request.path_params["origen"], DIMENSIONES, "origen")
+    destino = _elegir(request.path_params["destino"], DIMENSIONES, "destino")
+    if origen == destino:
+        raise HTTPException(400, "origen y destino deben ser dimensiones distintas")
+    valor = _elegir(request.query_params.get("valor", "total"), VALORES, "valor")
+    filtros = tuple(
+        (columna, "in", _valores(request, columna))
+        for columna in DIMENSIONES if columna in request.query_params
+    )
+    return tabla_sankey(origen, destino, valor, filtros)
+
+
+def _entidad(request):
+    columna = _elegir(request.query_params.get("columna", "pais"), COLUMNAS_PRONOSTICO, "columna")
+    entidad = request.query_params.get("entidad")
+    if entidad not in valores_distintos(columna):
+        raise HTTPException(404, f"No hay datos de {columna} = {entidad}")
+    horizonte = _elegir(_entero(request, "horizonte", obligatorio=True), HORIZONTES, "horizonte")
+    return columna, entidad, horizonte
+
+
+def pronostico_mensual(request):
+    columna, entidad, horizonte = _entidad(request)
+    df_model = serie_mensual(entidad, columna)
+    if len(df_model) < horizonte + 4:
+        raise HTTPException(422, f"No hay suficientes datos para: {entidad}")
+    resultado = leer_mensual(columna, entidad, horizonte) or entrenar_mensual(df_model, entidad, horizonte, columna)
+    return pd.DataFrame({
+        "fecha": resultado["fechas_pred"],
+        "real": resultado["y_te"].to_numpy(),
+        "xgboost": resultado["xgb"],
+        "tabpfn_mediana": resultado["tab_median"],
+        "tabpfn_q10": resultado["tab_q10"],
+        "tabpfn_q90": resultado["tab_q90"],
+    })
+
+
+def pronostico_nbeats(request):
+    columna, entidad, horizonte = _entidad(request)
+    grupo = _elegir(request.query_params.get("grupo", "mes"), tuple(FRECUENCIAS), "grupo")
+    guardado = leer_nbeats(columna, entidad, grupo, horizonte)
+    if guardado is not None:
+        return guardado
+    df_grouped = series_agrupadas(columna, grupo)
+    df_entidad = df_grouped[df_grouped["unique_id"] == entidad].sort_values("ds")
+    try:
+        return entrenar_nbeats(df_entidad, grupo, horizonte)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+
+async def transacciones(request):
+    formato = _elegir(request.query_params.get("formato", "csv"), ("csv", "parquet"), "formato")
+    desde, hasta = _fecha(request, "desde"), _fecha(request, "hasta")
+    filtros = filtros_transacciones(desde, hasta, request.query_params.getlist("pais"))
+    # El esquema puede requerir la carga en frío de los datos: fuera del event loop
+    esquema = await en_pool(esquema_filas)
+    return StreamingResponse(
+        trozos_exportacion(lotes_filas(filtros), formato, esquema),
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="transacciones_{desde}_{hasta}.{formato}"'},
+    )
+
+
+class GZipSalvoParquet:
+    """GZip para todas las respuestas salvo las exportaciones Parquet, que ya van comprimidas."""
+
+    def __init__(self, app, minimum_size=1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/transacciones":
+            formato = parse_qs(scope["query_string"].decode("latin-1")).get("formato", ["csv"])[0]
+            if formato == "parquet":
+                return await self.app(scope, receive, send)
+        await self.gzip(scope, receive, send)
+
+
+app = Starlette(
+    routes=[
+        Route("/kpis", recurso(kpis)),
+        Route("/sankey/{origen}/{destino}", recurso(sankey)),
+        Route("/pronosticos/mensual", recurso(pronostico_mensual)),
+        Route("/pronosticos/nbeats", recurso(pronostico_nbeats)),
+        Route("/transacciones", transacciones),
+    ],
+    middleware=[Middleware(GZipSalvoParquet, minimum_size=1024)],
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="API local del dashboard de ventas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+    uvicorn.run("comun.api:app", host=args.host, port=args.port)
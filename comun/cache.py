@@ -0,0 +1,185 @@
+"""Caché de resultados compartida por todas las sesiones del proceso.
+
+A diferencia de `st.cache_data`, tiene un presupuesto en bytes (CACHE_RESULTADOS_MB),
+vencimiento por antigüedad (CACHE_RESULTADOS_TTL, en segundos) y desalojo LRU, y lleva
+contadores de aciertos, fallos y desalojos que se ven en el panel de administración
+(`?admin=1` o ADMIN_CACHE=1). Las claves incluyen página, modelo, función, versión de
+los datos y parámetros, así que dos sesiones que piden lo mismo comparten el cálculo.
+"""
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from comun.coalescencia import CONTADORES, compartir
+
+PRESUPUESTO_MB = float(os.environ.get("CACHE_RESULTADOS_MB", 256))
+TTL = float(os.environ.get("CACHE_RESULTADOS_TTL", 6 * 3600))
+ADMIN = os.environ.get("ADMIN_CACHE", "0") == "1"
+
+
+def tamano(valor):
+    """Bytes aproximados que ocupa `valor` en memoria."""
+    if isinstance(valor, (pd.DataFrame, pd.Series, pd.Index)):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum() if hasattr(uso, "sum") else uso)
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamano(k) + tamano(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamano(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def clave_argumento(valor):
+    """Representación hashable de un argumento (los DataFrame se resumen por contenido)."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        digest = hashlib.sha1(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes()).hexdigest()
+        columnas = tuple(valor.columns) if isinstance(valor, pd.DataFrame) else valor.name
+        return ("pandas", valor.shape, columnas, digest)
+    if isinstance(valor, np.ndarray):
+        return ("numpy", valor.shape, str(valor.dtype), hashlib.sha1(valor.tobytes()).hexdigest())
+    if isinstance(valor, (list, tuple)):
+        return tuple(clave_argumento(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, clave_argumento(v)) for k, v in valor.items()))
+    return valor
+
+
+class CacheResultados:
+    def __init__(self, presupuesto_bytes, ttl):
+        self.presupuesto = presupuesto_bytes
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # clave → (valor, bytes, creada)
+        self._bytes = 0
+        self._bloqueo = threading.Lock()
+        self.aciertos = self.fallos = self.desalojos = self.vencidas = 0
+
+    def obtener(self, clave):
+        """(True, valor) si la clave está vigente; (False, None) si no."""
+        with self._bloqueo:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and time.monotonic() - entrada[2] > self.ttl:
+                self._quitar(clave)
+                self.vencidas += 1
+                entrada = None
+            if entrada is None:
+                self.fallos += 1
+                return False, None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return True, entrada[0]
+
+    def guardar(self, clave, valor):
+        bytes_valor = tamano(valor)
+        if bytes_valor > self.presupuesto:
+            return
+        with self._bloqueo:
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = (valor, bytes_valor, time.monotonic())
+            self._bytes += bytes_valor
+            while self._bytes > self.presupuesto:
+                self._quitar(next(iter(self._entradas)))
+                self.desalojos += 1
+
+    def _quitar(self, clave):
+        _, bytes_valor, _ = self._entradas.pop(clave)
+        self._bytes -= bytes_valor
+
+    def vaciar(self):
+        with self._bloqueo:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._bloqueo:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "MB usados": round(self._bytes / 2**20, 2),
+                "MB presupuesto": round(self.presupuesto / 2**20, 2),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa de aciertos": round(self.aciertos / consultas, 3) if consultas else None,
+                "desalojos (LRU)": self.desalojos,
+                "vencidas (TTL)": self.vencidas,
+            }
+
+    def entradas(self):
+        ahora = time.monotonic()
+        with self._bloqueo:
+            return [
+                {"página": clave[0], "modelo": clave[1], "función": clave[2],
+                 "KB": round(bytes_valor / 1024, 1), "edad (s)": round(ahora - creada)}
+                for clave, (_, bytes_valor, creada) in reversed(self._entradas.items())
+            ]
+
+
+CACHE = CacheResultados(int(PRESUPUESTO_MB * 2**20), TTL)
+
+
+def _version_actual():
+    # Importación diferida: comun.consultas también cachea sus agregaciones acá
+    from comun.consultas import backend, version_fuente
+
+    return backend(), version_fuente()
+
+
+def _calcular_y_guardar(clave, funcion, args, kwargs):
+    valor = funcion(*args, **kwargs)
+    CACHE.guardar(clave, valor)
+    return valor
+
+
+def cacheado(pagina, modelo, copiar=False):
+    """Cachea la función en CACHE con clave (página, modelo, función, versión de datos, parámetros).
+
+    El resultado se comparte entre sesiones: con `copiar=True` cada llamada recibe una
+    copia (para quien modifica el DataFrame devuelto); si no, no debe modificarse.
+    """
+    def decorar(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            clave = (pagina, modelo, funcion.__qualname__, *_version_actual(), clave_argumento(args), clave_argumento(kwargs))
+            encontrado, valor = CACHE.obtener(clave)
+            if not encontrado:
+                # Las sesiones que piden lo mismo a la vez esperan al primer cálculo
+                valor = compartir(clave, _calcular_y_guardar, clave, funcion, args, kwargs)
+            return valor.copy() if copiar and hasattr(valor, "copy") else valor
+        return envoltura
+    return decorar
+
+
+def admin_visible():
+    """Los paneles de administración se muestran con ?admin=1 o ADMIN_CACHE=1."""
+    if ADMIN:
+        return True
+    try:
+        return st.query_params.get("admin") == "1"
+    except Exception:
+        return False
+
+
+def panel_cache():
+    """Panel de administración de la caché compartida."""
+    if not admin_visible():
+        return
+    with st.sidebar.expander("Administración: caché de resultados", icon=":material/memory:"):
+        estadisticas = {**CACHE.estadisticas(), "cálculos ejecutados": CONTADORES["ejecutadas"],
+                        "cálculos compartidos": CONTADORES["compartidas"]}
+        st.dataframe(pd.Series(estadisticas, name="valor").astype(str), use_container_width=True)
+        entradas = CACHE.entradas()
+        if entradas:
+            st.dataframe(entradas, hide_index=True)
+        if st.button("Vaciar caché", icon=":material/delete:", key="vaciar_cache"):
+            CACHE.vaciar()
+            st.rerun()
@@ -0,0 +1,101 @@
+"""Variables de rezago y ventanas móviles para el XGBoost global de la página de predicción.
+
+Todas las entidades de un escenario (países o categorías) se procesan juntas en una matriz
+meses × entidades: cada variable es una sola operación vectorizada sobre esa matriz, y un
+único XGBoost entrenado con todas las entidades pronostica de forma recursiva, un paso
+por mes, prediciendo en cada paso todas las entidades con una sola llamada.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from comun import modelos
+from comun.cache import cacheado
+from comun.consultas import agregar, backend, version_fuente
+from comun.medicion import medir
+
+LAGS = (1, 2, 3, 6, 12)
+VENTANAS = (3, 6, 12)
+# Meses de historia que necesita la variable más larga (delta anual: t-1 contra t-13)
+MEMORIA = 13
+
+
+@st.cache_data(max_entries=8)
+def _panel_mensual(columna, motor, version):
+    df = agregar([columna, "periodo_mes"], [("Value", "total", "sum")])
+    ancho = df.pivot_table(index="periodo_mes", columns=columna, values="Value", aggfunc="sum")
+    ancho = ancho.asfreq("MS")
+    # Meses sin ventas cuentan como 0, salvo antes de la primera venta de la entidad
+    activo = ancho.notna().cummax()
+    return ancho.fillna(0).where(activo)
+
+
+def panel_mensual(columna):
+    """Total mensual en una matriz meses × entidades (NaN antes de la primera venta)."""
+    return _panel_mensual(columna, backend(), version_fuente())
+
+
+def caracteristicas(ancho):
+    """Variables de cada (mes, entidad) a partir de la matriz meses × entidades.
+
+    Solo usan meses anteriores al de la fila, así que sirven tanto para entrenar como
+    para pronosticar el mes siguiente. Devuelve un DataFrame indexado por (Date, entidad)
+    con las variables y el valor observado en `Value`.
+    """
+    previo = ancho.shift(1)
+    bloques = {f"lag_{lag}": ancho.shift(lag) for lag in LAGS}
+    for ventana in VENTANAS:
+        movil = previo.rolling(ventana, min_periods=1)
+        bloques[f"media_{ventana}"] = movil.mean()
+        bloques[f"desvio_{ventana}"] = movil.std()
+    bloques["delta_anual"] = previo - ancho.shift(MEMORIA)
+
+    indice = pd.MultiIndex.from_product([ancho.index, ancho.columns], names=["Date", "entidad"])
+    X = pd.DataFrame({nombre: bloque.to_numpy().ravel() for nombre, bloque in bloques.items()}, index=indice)
+    fechas = indice.get_level_values("Date")
+    X["month"] = fechas.month
+    X["quarter"] = fechas.quarter
+    X["entidad_cod"] = np.tile(np.arange(ancho.shape[1]), ancho.shape[0])
+    X["Value"] = ancho.to_numpy().ravel()
+    return X
+
+
+def pronosticar_panel(ancho, horiz):
+    """Entrena un XGBoost con todas las columnas de `ancho` y pronostica sus últimos `horiz` meses.
+
+    Devuelve las predicciones (meses × columnas) y la varianza de los residuos de
+    entrenamiento de cada columna, que usa la conciliación MinT de `comun.jerarquia`.
+    """
+    corte = ancho.index[-horiz]
+    with medir("caracteristicas"):
+        datos = caracteristicas(ancho)
+    entrenamiento = datos[(datos.index.get_level_values("Date") < corte) & datos["Value"].notna()]
+
+    XGBRegressor = modelos.cargar_modelo("xgboost")
+    xgb = XGBRegressor()
+    X_tr, y_tr = entrenamiento.drop(columns="Value"), entrenamiento["Value"]
+    with medir("xgboost.fit"):
+        xgb.fit(X_tr, y_tr)
+    residuos = y_tr - xgb.predict(X_tr)
+    varianza = residuos.groupby(level="entidad", sort=False).var().reindex(ancho.columns)
+
+    # Pronóstico recursivo: cada paso agrega un mes con las predicciones de todas las entidades
+    historia = ancho.loc[ancho.index < corte]
+    activas = ancho.loc[corte].notna().to_numpy()
+    with medir("xgboost.predict"):
+        for fecha in ancho.index[-horiz:]:
+            historia = pd.concat([historia, pd.DataFrame(np.nan, index=[fecha], columns=ancho.columns)])
+            paso = caracteristicas(historia.iloc[-(MEMORIA + 1):]).xs(fecha, level="Date")
+            prediccion = xgb.predict(paso.drop(columns="Value"))
+            historia.loc[fecha] = np.where(activas, prediccion, np.nan)
+    return historia.iloc[-horiz:], varianza
+
+
+@cacheado("prediccion", "xgboost_global")
+def _pronostico_global(columna, horiz, motor, version):
+    return pronosticar_panel(panel_mensual(columna), horiz)[0]
+
+
+def pronostico_xgb(columna, horiz):
+    """Predicciones de los últimos `horiz` meses (meses × entidades) con un XGBoost para todas las entidades."""
+    return _pronostico_global(columna, horiz, backend(), version_fuente())
@@ -0,0 +1,51 @@
+"""Coalescencia de cálculos pesados idénticos (single-flight).
+
+Si varias sesiones piden el mismo cálculo a la vez, solo la primera lo ejecuta; las
+demás esperan su resultado (o su excepción) en lugar de repetirlo. No guarda nada
+una vez terminado: para eso está `comun.cache`.
+"""
+import threading
+from concurrent.futures import Future
+from functools import wraps
+
+_en_curso = {}  # clave → Future del cálculo que se está ejecutando
+_bloqueo = threading.Lock()
+CONTADORES = {"ejecutadas": 0, "compartidas": 0}
+
+
+def compartir(clave, funcion, *args, **kwargs):
+    """Ejecuta `funcion` una sola vez por `clave` entre las llamadas concurrentes."""
+    with _bloqueo:
+        futuro = _en_curso.get(clave)
+        propio = futuro is None
+        if propio:
+            futuro = _en_curso[clave] = Future()
+            CONTADORES["ejecutadas"] += 1
+        else:
+            CONTADORES["compartidas"] += 1
+    if not propio:
+        return futuro.result()
+    try:
+        resultado = funcion(*args, **kwargs)
+    except BaseException as e:
+        futuro.set_exception(e)
+        raise
+    else:
+        futuro.set_result(resultado)
+        return resultado
+    finally:
+        with _bloqueo:
+            del _en_curso[clave]
+
+
+def coalescido(nombre):
+    """Decorador: las llamadas concurrentes con los mismos argumentos comparten el cálculo."""
+    from comun.cache import clave_argumento
+
+    def decorar(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            clave = (nombre, clave_argumento(args), clave_argumento(kwargs))
+            return compartir(clave, funcion, *args, **kwargs)
+        return envoltura
+    return decorar
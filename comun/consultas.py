@@ -0,0 +1,300 @@
+"""Agregaciones del dashboard con backend intercambiable (pandas o DuckDB).
+
+Con BACKEND_CONSULTAS=duckdb las consultas se ejecutan como SQL multihilo sobre el
+almacén particionado `datos/ventas/` o `datos/ventas.parquet` (leídos sin cargar
+todas las filas en pandas) o, si no existen, sobre una copia en DuckDB del Excel.
+Sin DuckDB instalado se usa pandas, que también aprovecha el almacén particionado
+para leer solo las particiones que piden los filtros.
+
+Los filtros son tuplas (columna, operador, valor) con operador "==", "<=", ">=" o "in".
+Las medidas son tuplas (alias, columna, función) con función "sum" o "count".
+"""
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from comun.cache import cacheado
+from comun.datos import (COLUMNAS_VENTAS, RAIZ, RUTA_PARTICIONES, aplicar_filtros, cargar_ventas, crear_particiones,
+                         esquema_particiones, hay_particiones, lotes_particiones, version_datos)
+from comun.medicion import medir
+
+RUTA_PARQUET = Path(os.environ.get("DATOS_PARQUET", RAIZ / "datos" / "ventas.parquet"))
+BACKEND = os.environ.get("BACKEND_CONSULTAS", "pandas").lower()
+# Filas por lote en las exportaciones por streaming (fija el techo de memoria)
+FILAS_POR_LOTE = int(os.environ.get("EXPORTACION_FILAS_POR_LOTE", 50_000))
+
+# Columnas derivadas que se pueden usar para agrupar
+DERIVADAS_SQL = {
+    "periodo_mes": "CAST(date_trunc('month', fecha) AS TIMESTAMP)",
+    "periodo_dia": "CAST(date_trunc('day', fecha) AS TIMESTAMP)",
+}
+OPERADORES = {"==": "=", "<=": "<=", ">=": ">="}
+TIPOS_ENTEROS = {"TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT"}
+
+
+def backend():
+    """Backend efectivo: "duckdb" solo si se pidió y está instalado."""
+    if BACKEND != "duckdb":
+        return "pandas"
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return "pandas"
+    return "duckdb"
+
+
+def version_fuente():
+    """Versión de la fuente que consulta el backend activo (Parquet o Excel)."""
+    if backend() == "duckdb" and not hay_particiones() and RUTA_PARQUET.exists():
+        info = RUTA_PARQUET.stat()
+        return f"parquet-{info.st_mtime_ns}-{info.st_size}"
+    return version_datos()
+
+
+# ----------------------------- pandas -----------------------------
+def _derivada(df, nombre):
+    if nombre == "periodo_mes":
+        return df["fecha"].dt.to_period("M").dt.to_timestamp()
+    if nombre == "periodo_dia":
+        return df["fecha"].dt.normalize()
+    return df[nombre]
+
+
+def _agregar_pandas(por, medidas, filtros):
+    # Solo se leen las columnas necesarias y, con particiones, solo las filas filtradas
+    columnas = {"fecha" if col in DERIVADAS_SQL else col for col in por}
+    columnas |= {columna for _, columna, _ in medidas}
+    df = cargar_ventas(sorted(columnas), filtros)
+    claves = {col: _derivada(df, col) for col in por}
+    resultado = df.groupby([claves[col].rename(col) for col in por], observed=True).agg(
+        **{alias: (columna, funcion) for alias, columna, funcion in medidas}
+    ).reset_index()
+    # Las claves categóricas vuelven a texto: el resultado es el mismo con cualquier backend
+    return resultado.astype({col: object for col in resultado.select_dtypes("category").columns})
+
+
+# ----------------------------- DuckDB -----------------------------
+_local = threading.local()
+
+
+@st.cache_resource
+def _conexion(version):
+    import duckdb
+
+    con = duckdb.connect()
+    if hay_particiones():
+        origen = (RUTA_PARTICIONES / "**" / "*.parquet").as_posix()
+        con.execute(f"CREATE VIEW ventas AS SELECT * FROM read_parquet('{origen}', hive_partitioning = true)")
+    elif RUTA_PARQUET.exists():
+        con.execute(f"CREATE VIEW ventas AS SELECT * FROM read_parquet('{RUTA_PARQUET.as_posix()}')")
+    else:
+        df = cargar_ventas()
+        con.execute("CREATE TABLE ventas AS SELECT * FROM df")
+    return con
+
+
+def _cursor():
+    # Las conexiones de DuckDB no se comparten entre hilos: cada sesión usa su cursor
+    version = version_fuente()
+    if getattr(_local, "version", None) != version:
+        _local.cursor = _conexion(version).cursor()
+        _local.version = version
+    return _local.cursor
+
+
+def _parametro(valor):
+    return valor.item() if hasattr(valor, "item") else valor
+
+
+def _where(filtros):
+    condiciones, parametros = [], []
+    for columna, operador, valor in filtros:
+        if operador == "in":
+            valores = [_parametro(v) for v in valor]
+            if not valores:
+                condiciones.append("FALSE")
+                continue
+            condiciones.append(f'"{columna}" IN ({", ".join("?" for _ in valores)})')
+            parametros.extend(valores)
+        elif operador in OPERADORES:
+            condiciones.append(f'"{columna}" {OPERADORES[operador]} ?')
+            parametros.append(_parametro(valor))
+        else:
+            raise ValueError(f"Operador no soportado: {operador}")
+    return (" WHERE " + " AND ".join(condiciones) if condiciones else ""), parametros
+
+
+def _sin_diccionarios(datos):
+    # Las columnas category/ENUM (diccionarios en Arrow) vuelven a texto: mismo resultado con cualquier backend
+    import pyarrow as pa
+
+    columnas = [c.cast(c.type.value_type) if pa.types.is_dictionary(c.type) else c for c in datos.columns]
+    return type(datos).from_arrays(columnas, names=datos.schema.names)
+
+
+def consultar_arrow(sql, parametros=()):
+    """Ejecuta SQL sobre la tabla `ventas` y devuelve una tabla Arrow."""
+    # fetch_arrow_table: desde DuckDB 1.4 `.arrow()` devuelve un RecordBatchReader
+    return _sin_diccionarios(_cursor().execute(sql, list(parametros)).fetch_arrow_table())
+
+
+@st.cache_data
+def _tipos_duckdb(version):
+    tabla = consultar_arrow("DESCRIBE ventas")
+    return dict(zip(tabla.column("column_name").to_pylist(), tabla.column("column_type").to_pylist()))
+
+
+def _suma_sql(columna):
+    # sum() de enteros da HUGEINT en DuckDB: se vuelve a BIGINT para dar int64 como pandas
+    tipo = "BIGINT" if _tipos_duckdb(version_fuente()).get(columna) in TIPOS_ENTEROS else "DOUBLE"
+    return f'CAST(sum("{columna}") AS {tipo})'
+
+
+def _agregar_duckdb(por, medidas, filtros):
+    grupos = [f'{DERIVADAS_SQL[col]} AS "{col}"' if col in DERIVADAS_SQL else f'"{col}"' for col in por]
+    agregados = [
+        f'{_suma_sql(columna)} AS "{alias}"' if funcion == "sum" else f'count("{columna}") AS "{alias}"'
+        for alias, columna, funcion in medidas
+    ]
+    where, parametros = _where(filtros)
+    posiciones = ", ".join(str(i) for i in range(1, len(por) + 1))
+    sql = f"SELECT {', '.join(grupos + agregados)} FROM ventas{where} GROUP BY {posiciones} ORDER BY {posiciones}"
+    return consultar_arrow(sql, parametros)
+
+
+# ----------------------------- API -----------------------------
+@cacheado("consultas", "agregar", copiar=True)
+def _agregar(por, medidas, filtros, motor, version):
+    if motor == "duckdb":
+        return _agregar_duckdb(por, medidas, filtros).to_pandas()
+    return _agregar_pandas(por, medidas, filtros)
+
+
+def agregar(por, medidas, filtros=()):
+    """Agrupa por las columnas `por` y calcula `medidas` sobre las filas que cumplen `filtros`."""
+    with medir(f"agregar[{','.join(por)}]"):
+        return _agregar(tuple(por), tuple(medidas), tuple(filtros), backend(), version_fuente())
+
+
+@st.cache_data
+def _valores_distintos(columna, motor, version):
+    if motor == "duckdb":
+        tabla = consultar_arrow(f'SELECT "{columna}" FROM ventas WHERE "{columna}" IS NOT NULL GROUP BY 1 ORDER BY min(fecha), 1')
+        return tabla.column(0).to_pylist()
+    df = cargar_ventas([columna, "fecha"])
+    if df[columna].dtype == "category":
+        # El orden de las categorías depende del origen (Excel o particiones): se desempata por el valor
+        df = df.astype({columna: object})
+    # Los empates de fecha se desempatan por el valor, igual que en DuckDB
+    df = df.sort_values(["fecha", columna], kind="stable")
+    return df[columna].dropna().unique().tolist()
+
+
+def valores_distintos(columna):
+    """Valores de `columna` en orden de primera aparición en el tiempo."""
+    return _valores_distintos(columna, backend(), version_fuente())
+
+
+def filas(filtros=(), columnas=None, limite=None):
+    """Filas crudas que cumplen `filtros` (todas las columnas si `columnas` es None)."""
+    if backend() == "duckdb":
+        seleccion = ", ".join(f'"{c}"' for c in columnas) if columnas else "*"
+        where, parametros = _where(filtros)
+        sql = f"SELECT {seleccion} FROM ventas{where}" + (f" LIMIT {int(limite)}" if limite else "")
+        return consultar_arrow(sql, parametros).to_pandas()
+    df = cargar_ventas(columnas, filtros)
+    return df.head(limite) if limite else df
+
+
+@cacheado("consultas", "orden_filas")
+def _permutacion(filtros, orden, ascendente):
+    # Posiciones de las filas filtradas en el orden pedido (se reutilizan al paginar)
+    serie = cargar_ventas([orden], filtros)[orden].reset_index(drop=True)
+    return serie.sort_values(ascending=ascendente, kind="stable", na_position="last").index.to_numpy()
+
+
+def pagina_filas(filtros=(), orden=None, ascendente=True, desde=0, cantidad=100):
+    """Filas [desde, desde + cantidad) que cumplen `filtros`, ordenadas por `orden`, como tabla Arrow.
+
+    Devuelve (tabla, total de filas filtradas): el filtro, el orden y el recorte se
+    resuelven en el servidor y solo la página viaja al navegador.
+    """
+    import pyarrow as pa
+
+    filtros = tuple(filtros)
+    if orden is not None and orden not in COLUMNAS_VENTAS:
+        raise ValueError(f"Columna de orden desconocida: {orden}")
+    if backend() == "duckdb":
+        where, parametros = _where(filtros)
+        total = consultar_arrow(f"SELECT count(*) FROM ventas{where}", parametros).column(0)[0].as_py()
+        orden_sql = f' ORDER BY "{orden}" {"ASC" if ascendente else "DESC"}, orden' if orden else ""
+        sql = f"SELECT * FROM ventas{where}{orden_sql} LIMIT {int(cantidad)} OFFSET {int(desde)}"
+        return consultar_arrow(sql, parametros), total
+    df = cargar_ventas(None, filtros)
+    if orden is None:
+        posiciones = np.arange(desde, min(desde + cantidad, len(df)))
+    else:
+        posiciones = _permutacion(filtros, orden, ascendente)[desde:desde + cantidad]
+    return pa.Table.from_pandas(df.iloc[posiciones], preserve_index=False), len(df)
+
+
+def esquema_filas():
+    """Esquema Arrow de los lotes que entrega `lotes_filas` con el backend activo."""
+    import pyarrow as pa
+
+    if backend() == "duckdb":
+        return consultar_arrow("SELECT * FROM ventas LIMIT 0").schema
+    if hay_particiones():
+        esquema = esquema_particiones()
+    else:
+        esquema = pa.Schema.from_pandas(cargar_ventas().iloc[:0], preserve_index=False)
+    return pa.schema([
+        campo.with_type(campo.type.value_type) if pa.types.is_dictionary(campo.type) else campo for campo in esquema
+    ])
+
+
+def lotes_filas(filtros=(), filas_por_lote=FILAS_POR_LOTE):
+    """Filas crudas que cumplen `filtros` como lotes Arrow de hasta `filas_por_lote` filas.
+
+    Ningún backend materializa el resultado completo: DuckDB y el almacén particionado
+    lo leen por lotes y, con el Excel cacheado, se filtra el dataset compartido de a
+    un bloque. Así la memoria de una exportación queda acotada al tamaño del lote.
+    """
+    import pyarrow as pa
+
+    filtros = tuple(filtros)
+    if backend() == "duckdb":
+        where, parametros = _where(filtros)
+        lotes = _cursor().execute(f"SELECT * FROM ventas{where}", parametros).fetch_record_batch(filas_por_lote)
+    elif hay_particiones():
+        lotes = lotes_particiones(filtros, filas_por_lote)
+    else:
+        completo = cargar_ventas()
+        lotes = (
+            pa.RecordBatch.from_pandas(aplicar_filtros(completo.iloc[inicio:inicio + filas_por_lote], filtros), preserve_index=False)
+            for inicio in range(0, len(completo), filas_por_lote)
+        )
+    for lote in lotes:
+        if lote.num_rows:
+            yield _sin_diccionarios(lote)
+
+
+def crear_parquet(destino=RUTA_PARQUET):
+    """Convierte el Excel vigente en el Parquet que usa el backend DuckDB."""
+    cargar_ventas().to_parquet(destino, index=False)
+    return destino
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera los almacenes columnares a partir del Excel de ventas.")
+    parser.add_argument("--particiones", action="store_true", help="Parquet particionado por anio/mes/pais en lugar de un único archivo")
+    args = parser.parse_args()
+    if args.particiones:
+        print(f"Almacén particionado generado en {crear_particiones()}")
+    else:
+        print(f"Parquet generado en {crear_parquet()}")
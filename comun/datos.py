@@ -0,0 +1,205 @@
+import os
+import shutil
+from contextlib import nullcontext
+from datetime import datetime, time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from comun.medicion import medido
+
+RAIZ = Path(__file__).resolve().parent.parent
+# DATOS_VENTAS permite apuntar el dashboard a otro archivo con el mismo esquema
+RUTA_DATOS = Path(os.environ.get("DATOS_VENTAS", RAIZ / "datos" / "db-datos.xlsx"))
+# Almacén Parquet particionado estilo hive (anio=/mes=/pais=) generado desde el Excel
+RUTA_PARTICIONES = Path(os.environ.get("DATOS_PARTICIONADOS", RAIZ / "datos" / "ventas"))
+COLUMNAS_PARTICION = ["anio", "mes", "pais"]
+MARCA_VERSION = "_version"
+COLUMNAS_VENTAS = ["orden", "anio", "mes", "dia", "fecha", "pais", "ciudad", "categoria", "producto",
+                   "precio", "util_porcent", "cantidad", "total", "utilidad"]
+# Texto con pocos valores distintos: como category ocupa una fracción de la memoria
+COLUMNAS_CATEGORICAS = ["pais", "ciudad", "categoria", "producto"]
+
+try:
+    pd.get_option("mode.copy_on_write")
+    HAY_COPY_ON_WRITE = True
+except KeyError:  # pandas anterior a 1.5
+    HAY_COPY_ON_WRITE = False
+
+
+def _copy_on_write():
+    # Solo durante las selecciones del dataset compartido, sin cambiar la opción global del proceso
+    return pd.option_context("mode.copy_on_write", True) if HAY_COPY_ON_WRITE else nullcontext()
+
+
+def hay_particiones():
+    return (RUTA_PARTICIONES / MARCA_VERSION).exists()
+
+
+def version_datos(ruta=None):
+    """Identificador de la versión del dataset (fecha de modificación y tamaño).
+
+    Forma parte de la clave de todas las cachés que dependen de los datos, así que
+    reemplazar el archivo invalida los resultados anteriores sin reiniciar el servidor.
+    Si existe el almacén particionado, la versión es la de su última generación.
+    """
+    if ruta is None:
+        ruta = RUTA_PARTICIONES / MARCA_VERSION if hay_particiones() else RUTA_DATOS
+    info = os.stat(ruta)
+    return f"{info.st_mtime_ns}-{info.st_size}"
+
+
+# Un único DataFrame por versión, compartido sin copiar por todas las sesiones: no modificarlo
+@st.cache_resource(max_entries=2, show_spinner="Cargando datos...")
+def _leer_ventas(ruta, version):
+    df = pd.read_excel(ruta, sheet_name="Hoja1", parse_dates=["fecha"])
+    df = df.dropna(subset=["fecha", "total"])
+    return df.astype({columna: "category" for columna in COLUMNAS_CATEGORICAS if columna in df})
+
+
+def _expresion(filtros):
+    import pyarrow.compute as pc
+
+    expresion = None
+    for columna, operador, valor in filtros:
+        campo = pc.field(columna)
+        if operador == "in":
+            condicion = campo.isin(list(valor))
+        elif operador == "==":
+            condicion = campo == valor
+        elif operador == "<=":
+            condicion = campo <= valor
+        elif operador == ">=":
+            condicion = campo >= valor
+        else:
+            raise ValueError(f"Operador no soportado: {operador}")
+        expresion = condicion if expresion is None else expresion & condicion
+    return expresion
+
+
+def leer_particiones(filtros=(), columnas=None):
+    """Lee del almacén particionado solo las particiones y columnas necesarias.
+
+    Los filtros sobre anio/mes/pais descartan directorios completos sin abrirlos; el
+    resto se evalúa por row group con las estadísticas de Parquet.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(RUTA_PARTICIONES, format="parquet", partitioning="hive")
+    tabla = dataset.to_table(columns=columnas, filter=_expresion(filtros))
+    return tabla.to_pandas()
+
+
+def _dataset_particiones():
+    import pyarrow.dataset as ds
+
+    return ds.dataset(RUTA_PARTICIONES, format="parquet", partitioning="hive")
+
+
+def esquema_particiones():
+    """Esquema Arrow de las filas del almacén particionado (incluye anio, mes y pais)."""
+    return _dataset_particiones().schema
+
+
+def lotes_particiones(filtros=(), filas_por_lote=50_000):
+    """Recorre el almacén particionado en lotes Arrow sin materializar el resultado."""
+    yield from _dataset_particiones().to_batches(filter=_expresion(filtros), batch_size=filas_por_lote)
+
+
+@medido("cargar_datos")
+def cargar_ventas(columnas=None, filtros=()):
+    """Dataset de ventas de la versión vigente, opcionalmente filtrado y reducido a `columnas`.
+
+    Con el almacén particionado los filtros se aplican al leer (predicate pushdown);
+    sin él se filtra en memoria el Excel cacheado. En ese caso el resultado puede
+    compartir memoria con el dataset cacheado: es de solo lectura.
+    """
+    if hay_particiones():
+        return leer_particiones(filtros, columnas)
+    # Con copy-on-write las selecciones son vistas en lugar de copias de las columnas
+    with _copy_on_write():
+        df = aplicar_filtros(_leer_ventas(str(RUTA_DATOS), version_datos()), filtros)
+        return df[columnas] if columnas else df
+
+
+def crear_particiones(destino=RUTA_PARTICIONES, df=None, version=None):
+    """Escribe el Excel vigente (u otro `df` con el mismo esquema) como Parquet particionado por anio/mes/pais.
+
+    Con `df` hay que indicar la `version` que identifica esos datos. El almacén se
+    escribe completo en un directorio nuevo y recién entonces reemplaza a `destino`:
+    no quedan particiones de una generación anterior (un país o mes que ya no está).
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if df is None:
+        version = version_datos(RUTA_DATOS)
+        df = _leer_ventas(str(RUTA_DATOS), version)
+    elif not version:
+        raise ValueError("crear_particiones con `df` requiere la `version` de esos datos")
+
+    destino = Path(destino)
+    nuevo, anterior = destino.with_name(destino.name + ".nuevo"), destino.with_name(destino.name + ".anterior")
+    shutil.rmtree(nuevo, ignore_errors=True)
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        nuevo,
+        format="parquet",
+        partitioning=COLUMNAS_PARTICION,
+        partitioning_flavor="hive",
+    )
+    (nuevo / MARCA_VERSION).write_text(version)
+    shutil.rmtree(anterior, ignore_errors=True)
+    if destino.exists():
+        destino.rename(anterior)
+    nuevo.rename(destino)
+    shutil.rmtree(anterior, ignore_errors=True)
+    return destino
+
+
+def aplicar_filtros(df, filtros=()):
+    """Aplica filtros expresados como tuplas (columna, operador, valor).
+
+    Los operadores son "==", "<=", ">=" e "in"; es el mismo formato que aceptan las
+    consultas de `comun.consultas`, así que un filtro sirve para ambos backends.
+    """
+    mascara = pd.Series(True, index=df.index)
+    for columna, operador, valor in filtros:
+        serie = df[columna]
+        if operador == "in":
+            mascara &= serie.isin(valor)
+        elif operador == "==":
+            mascara &= serie == valor
+        elif operador == "<=":
+            mascara &= serie <= valor
+        elif operador == ">=":
+            mascara &= serie >= valor
+        else:
+            raise ValueError(f"Operador no soportado: {operador}")
+    return df if mascara.all() else df[mascara]
+
+
+def filtros_ventas(anio=None, mes_hasta=None, paises=None):
+    """Filtros comunes del análisis: año, meses hasta `mes_hasta` y países (vacío = todos)."""
+    filtros = []
+    if anio:
+        filtros.append(("anio", "==", anio))
+    if mes_hasta:
+        filtros.append(("mes", "<=", mes_hasta))
+    if paises:
+        filtros.append(("pais", "in", tuple(paises)))
+    return tuple(filtros)
+
+
+def filtros_transacciones(desde, hasta, paises=None):
+    """Filtros de un rango de fechas (inclusive) y países; el año permite descartar particiones."""
+    filtros = [
+        ("anio", ">=", desde.year),
+        ("anio", "<=", hasta.year),
+        ("fecha", ">=", datetime.combine(desde, time.min)),
+        ("fecha", "<=", datetime.combine(hasta, time.max)),
+    ]
+    if paises:
+        filtros.append(("pais", "in", tuple(paises)))
+    return tuple(filtros)
@@ -0,0 +1,33 @@
+import os
+
+import streamlit as st
+
+CSS_FILE = "asset/styles.css"
+
+
+# El CSS se lee una vez por versión del archivo (mtime) y se comparte entre sesiones
+@st.cache_resource
+def _leer_css(css_file, version):
+    with open(css_file) as f:
+        return f.read()
+
+
+def aplicar_estilo(css_file=CSS_FILE):
+    try:
+        css = _leer_css(css_file, os.path.getmtime(css_file))
+    except FileNotFoundError:
+        st.error(f"No se encontró el archivo de estilo: {css_file}", icon=":material/cancel:")
+        return
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+# --------------- footer -----------------------------
+def pie_de_pagina():
+    st.write("---")
+    with st.container():
+        st.write("&copy; - derechos reservados -  2025 -  Walter Gómez - FullStack Developer - Data Science - Business Intelligence")
+        left, right = st.columns(2, gap='medium', vertical_alignment="bottom")
+        with left:
+            st.link_button("Mi LinkedIn", "https://www.linkedin.com/in/walter-gomez-fullstack-developer-datascience-businessintelligence-finanzas-python/")
+        with right:
+            st.link_button("Mi Porfolio", "https://walter-portfolio-animado.netlify.app/")
@@ -0,0 +1,62 @@
+"""Explorador de tablas paginado: filtro, orden y recorte en el servidor.
+
+Solo la página visible se envía al navegador como tabla Arrow, así que recorrer una
+tabla de millones de filas no serializa el DataFrame completo.
+"""
+import numpy as np
+import pyarrow as pa
+import streamlit as st
+
+from comun.datos import aplicar_filtros
+
+TAMANOS_PAGINA = (50, 100, 500, 1000)
+SIN_ORDEN = "(sin orden)"
+
+
+def pagina_df(df, filtros=(), orden=None, ascendente=True, desde=0, cantidad=100):
+    """Equivalente de `comun.consultas.pagina_filas` para un DataFrame ya calculado."""
+    df = aplicar_filtros(df, filtros)
+    if orden is None:
+        posiciones = np.arange(desde, min(desde + cantidad, len(df)))
+    else:
+        serie = df[orden].reset_index(drop=True)
+        posiciones = serie.sort_values(ascending=ascendente, kind="stable", na_position="last").index.to_numpy()[desde:desde + cantidad]
+    return pa.Table.from_pandas(df.iloc[posiciones], preserve_index=False), len(df)
+
+
+def explorador(clave, obtener_pagina, columnas, opciones_filtro=None):
+    """Dibuja filtros, orden y paginación y muestra solo la página pedida.
+
+    `obtener_pagina(filtros, orden, ascendente, desde, cantidad)` devuelve (tabla, total);
+    `opciones_filtro` es {columna: valores} para los filtros de selección múltiple.
+    """
+    opciones_filtro = opciones_filtro or {}
+    filtros = []
+    if opciones_filtro:
+        for columna_widget, (columna, opciones) in zip(st.columns(len(opciones_filtro)), opciones_filtro.items()):
+            with columna_widget:
+                elegidos = st.multiselect(f"Filtrar {columna}", opciones, key=f"{clave}_filtro_{columna}")
+            if elegidos:
+                filtros.append((columna, "in", tuple(elegidos)))
+
+    col_orden, col_sentido, col_tamano, col_pagina = st.columns(4)
+    with col_orden:
+        orden = st.selectbox("Ordenar por", [SIN_ORDEN, *columnas], key=f"{clave}_orden")
+    with col_sentido:
+        ascendente = st.toggle("Ascendente", value=True, key=f"{clave}_ascendente")
+    with col_tamano:
+        cantidad = st.selectbox("Filas por página", TAMANOS_PAGINA, key=f"{clave}_tamano")
+    with col_pagina:
+        numero = st.number_input("Página", min_value=1, value=1, step=1, key=f"{clave}_pagina")
+
+    orden = None if orden == SIN_ORDEN else orden
+    desde = (int(numero) - 1) * cantidad
+    tabla, total = obtener_pagina(tuple(filtros), orden, ascendente, desde, cantidad)
+    if total and desde >= total:
+        # Página fuera de rango (p. ej. después de filtrar): se muestra la última
+        desde = (total - 1) // cantidad * cantidad
+        tabla, total = obtener_pagina(tuple(filtros), orden, ascendente, desde, cantidad)
+
+    st.dataframe(tabla, hide_index=True, use_container_width=True)
+    paginas = max((total + cantidad - 1) // cantidad, 1)
+    st.caption(f"Filas {desde + 1 if total else 0:,}–{desde + tabla.num_rows:,} de {total:,} · página {desde // cantidad + 1} de {paginas}")
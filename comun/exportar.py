@@ -0,0 +1,202 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import urlencode
+
+import xlsxwriter
+
+from comun.coalescencia import compartir
+
+FORMATOS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Exportaciones de transacciones ya generadas, reutilizadas mientras no cambien filtros ni datos
+DIR_EXPORTACIONES = Path(os.environ.get("EXPORTACIONES_DIR", Path(tempfile.gettempdir()) / "dashboard-ventas-exportaciones"))
+MAX_EXPORTACIONES = int(os.environ.get("EXPORTACIONES_MAX", 8))
+# Tope de lo que la página entrega con st.download_button (que carga el archivo en memoria)
+DESCARGA_MAX_MB = float(os.environ.get("EXPORTACION_DESCARGA_MB", 200))
+# URL de la API local (python -m comun.api) para descargar exportaciones grandes por streaming
+URL_API = os.environ.get("API_URL")
+
+
+def _filas(df, tamano_bloque=50_000):
+    # Convierte por bloques a tipos nativos de Python (NaN/NaT → celda vacía)
+    for inicio in range(0, len(df), tamano_bloque):
+        bloque = df.iloc[inicio:inicio + tamano_bloque]
+        bloque = bloque.astype(object).where(bloque.notna(), None)
+        yield from bloque.itertuples(index=False, name=None)
+
+
+def escribir_xlsx(hojas, destino):
+    """Escribe un libro con una hoja por DataFrame en modo `constant_memory`.
+
+    `hojas` es un dict nombre → DataFrame (o un iterable de pares, que permite generar
+    cada tabla justo antes de escribirla) y `destino` una ruta o un objeto de archivo.
+    Las filas se escriben en orden y xlsxwriter las vuelca a disco a medida que
+    avanza, por lo que el consumo de memoria no crece con el tamaño de la tabla.
+    """
+    libro = xlsxwriter.Workbook(destino, {
+        "constant_memory": True,
+        "nan_inf_to_errors": True,
+        "default_date_format": "yyyy-mm-dd",
+    })
+    encabezado = libro.add_format({"bold": True})
+    for nombre, df in (hojas.items() if isinstance(hojas, dict) else hojas):
+        hoja = libro.add_worksheet(nombre[:31])
+        hoja.write_row(0, 0, [str(columna) for columna in df.columns], encabezado)
+        for fila, valores in enumerate(_filas(df), start=1):
+            hoja.write_row(fila, 0, valores)
+    libro.close()
+
+
+def escribir_xlsx_temporal(hojas):
+    """Escribe el libro en un archivo temporal y devuelve su ruta (el llamador lo borra)."""
+    descriptor, ruta = tempfile.mkstemp(suffix=".xlsx")
+    os.close(descriptor)
+    try:
+        escribir_xlsx(hojas, ruta)
+    except Exception:
+        os.remove(ruta)
+        raise
+    return ruta
+
+
+class _Tubo(io.RawIOBase):
+    # Destino de escritura que acumula lo escrito hasta que se vacía
+    def __init__(self):
+        super().__init__()
+        self.trozos, self.posicion = [], 0
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self.trozos.append(bytes(datos))
+        self.posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self.posicion
+
+    def vaciar(self):
+        datos = b"".join(self.trozos)
+        self.trozos.clear()
+        return datos
+
+
+def _fechas_csv(datos):
+    # Las fechas (timestamp de día) van al CSV como AAAA-MM-DD en lugar de "2024-01-01 00:00:00.000000000"
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    columnas = [pc.strftime(c, format="%Y-%m-%d") if pa.types.is_timestamp(c.type) else c for c in datos.columns]
+    return type(datos).from_arrays(columnas, names=datos.schema.names)
+
+
+def trozos_exportacion(lotes, formato="csv", esquema=None):
+    """Convierte lotes Arrow en trozos de bytes CSV o Parquet a medida que llegan.
+
+    Cada lote se escribe y se entrega antes de pedir el siguiente (en Parquet, un
+    grupo de filas por lote), así que la memoria queda acotada al tamaño del lote
+    sin importar cuántas filas tenga la exportación. Si no llega ningún lote, se usa
+    `esquema` para que el archivo vacío siga siendo válido (encabezado CSV o Parquet
+    sin filas).
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    if formato not in ("csv", "parquet"):
+        raise ValueError(f"Formato de exportación no soportado: {formato}")
+    if formato == "csv":
+        lotes = (_fechas_csv(lote) for lote in lotes)
+        if esquema is not None:
+            esquema = pa.schema([campo.with_type(pa.string()) if pa.types.is_timestamp(campo.type) else campo for campo in esquema])
+
+    def abrir(esquema):
+        return pacsv.CSVWriter(tubo, esquema) if formato == "csv" else pq.ParquetWriter(tubo, esquema)
+
+    tubo, escritor = _Tubo(), None
+    for lote in lotes:
+        if escritor is None:
+            escritor = abrir(lote.schema)
+        escritor.write_batch(lote)
+        yield tubo.vaciar()
+    if escritor is None:
+        if esquema is None:
+            return
+        escritor = abrir(esquema)
+        escritor.write_table(esquema.empty_table())
+    escritor.close()
+    yield tubo.vaciar()
+
+
+def escribir_lotes_temporal(lotes, formato="csv", esquema=None):
+    """Escribe los lotes en un archivo temporal y devuelve su ruta (el llamador lo borra)."""
+    descriptor, ruta = tempfile.mkstemp(suffix=f".{formato}")
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            for trozo in trozos_exportacion(lotes, formato, esquema):
+                archivo.write(trozo)
+    except Exception:
+        os.remove(ruta)
+        raise
+    return ruta
+
+
+def _podar_exportaciones():
+    # Se conservan las MAX_EXPORTACIONES usadas más recientemente
+    archivos = sorted(DIR_EXPORTACIONES.glob("*.*"), key=lambda ruta: ruta.stat().st_mtime, reverse=True)
+    for ruta in archivos[MAX_EXPORTACIONES:]:
+        ruta.unlink(missing_ok=True)
+
+
+def archivo_exportacion(clave, formato, generar):
+    """Ruta del archivo de la exportación `clave`, generándolo una sola vez.
+
+    `generar()` devuelve (lotes, esquema) y solo se llama si el archivo no existe. La
+    clave debe incluir filtros, formato y versión de datos: las sesiones que piden la
+    misma exportación a la vez comparten la escritura, y los pedidos siguientes
+    reutilizan el archivo. Quedan en DIR_EXPORTACIONES, sin que el llamador los borre.
+    """
+    ruta = DIR_EXPORTACIONES / f"{hashlib.sha1(repr(clave).encode()).hexdigest()}.{formato}"
+
+    def escribir():
+        if ruta.exists():
+            os.utime(ruta)
+        else:
+            DIR_EXPORTACIONES.mkdir(parents=True, exist_ok=True)
+            lotes, esquema = generar()
+            shutil.move(escribir_lotes_temporal(lotes, formato, esquema), ruta)
+            _podar_exportaciones()
+        return ruta
+
+    return compartir(("exportacion", ruta.name), escribir)
+
+
+def url_transacciones(desde, hasta, paises=(), formato="csv"):
+    """URL de /transacciones en la API local con estos filtros (None si API_URL no está definida)."""
+    if not URL_API:
+        return None
+    parametros = [("desde", desde.isoformat()), ("hasta", hasta.isoformat()), ("formato", formato)]
+    parametros += [("pais", pais) for pais in paises]
+    return f"{URL_API.rstrip('/')}/transacciones?{urlencode(parametros)}"
+
+
+def exportar_tabla(df, formato="xlsx", hoja="Datos"):
+    """Devuelve los bytes de `df` en el formato pedido (xlsx, csv o parquet)."""
+    if formato == "csv":
+        return df.to_csv(index=False).encode()
+    buffer = io.BytesIO()
+    if formato == "parquet":
+        df.to_parquet(buffer, index=False)
+    elif formato == "xlsx":
+        escribir_xlsx({hoja: df}, buffer)
+    else:
+        raise ValueError(f"Formato de exportación no soportado: {formato}")
+    return buffer.getvalue()
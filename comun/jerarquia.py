@@ -0,0 +1,107 @@
+"""Pronóstico jerárquico conciliado sobre país → ciudad y categoría → producto.
+
+Cada árbol tiene tres niveles (Total, padres y hojas) y se describe con una matriz de
+suma dispersa S (nodos × hojas) tal que y_nodos = S · y_hojas. Los pronósticos base de
+todos los nodos salen de un único XGBoost global (`comun.caracteristicas`), así que el
+costo no crece con un modelo por hoja. La conciliación los vuelve coherentes (los hijos
+suman el padre) con bottom-up, OLS o MinT con varianzas de los residuos (WLS), resolviendo
+el sistema S'W⁻¹S con gradiente conjugado sobre S dispersa.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, cg
+
+from comun.cache import cacheado
+from comun.caracteristicas import pronosticar_panel
+from comun.consultas import agregar, backend, version_fuente
+from comun.medicion import medir
+
+# Padre → hoja de cada árbol disponible
+JERARQUIAS = {"pais": "ciudad", "categoria": "producto"}
+METODOS = {"mint": "MinT (WLS)", "ols": "OLS", "bottom_up": "Bottom-up"}
+TOTAL = "Total"
+SEPARADOR = " / "
+
+
+def matriz_suma(padres_hoja, padres):
+    """S dispersa: fila de Total, una fila por padre y la identidad de las hojas."""
+    n = len(padres_hoja)
+    filas = np.concatenate([np.zeros(n, dtype=int), 1 + padres.get_indexer(padres_hoja), 1 + len(padres) + np.arange(n)])
+    columnas = np.tile(np.arange(n), 3)
+    return sparse.csr_matrix((np.ones(3 * n), (filas, columnas)), shape=(1 + len(padres) + n, n))
+
+
+@st.cache_data(max_entries=8)
+def _estructura(padre, motor, version):
+    hoja = JERARQUIAS[padre]
+    df = agregar(["periodo_mes", padre, hoja], [("Value", "total", "sum")])
+    hojas = df.pivot_table(index="periodo_mes", columns=[padre, hoja], values="Value", aggfunc="sum").asfreq("MS")
+    activo = hojas.notna().cummax()
+
+    pares = hojas.columns
+    padres = pares.get_level_values(0).unique()
+    S = matriz_suma(pares.get_level_values(0), padres)
+    nombres = [TOTAL, *map(str, padres), *(f"{p}{SEPARADOR}{h}" for p, h in pares)]
+
+    # Series de todos los nodos: suma de las hojas (un nodo está activo si alguna hoja lo está)
+    valores = (S @ hojas.fillna(0).to_numpy().T).T
+    activos = (S @ activo.to_numpy().T.astype(float)).T > 0
+    nodos = pd.DataFrame(np.where(activos, valores, np.nan), index=hojas.index, columns=nombres)
+    return {"S": S, "nombres": nombres, "padres": [str(p) for p in padres], "historia": nodos}
+
+
+def estructura(padre):
+    """Matriz de suma, nombres de nodos e historia mensual de todos los nodos del árbol de `padre`."""
+    return _estructura(padre, backend(), version_fuente())
+
+
+@cacheado("prediccion", "jerarquia")
+def _base(padre, horiz, motor, version):
+    return pronosticar_panel(estructura(padre)["historia"], horiz)
+
+
+def conciliar(S, base, metodo="mint", varianza=None):
+    """Pronósticos coherentes a partir de `base` (períodos × nodos)."""
+    base = np.nan_to_num(np.asarray(base, dtype=float))
+    n_hojas = S.shape[1]
+    if metodo == "bottom_up":
+        return (S @ base[:, -n_hojas:].T).T
+
+    if metodo == "mint" and varianza is not None:
+        varianza = pd.Series(varianza, dtype=float)
+        varianza = varianza.fillna(varianza.median()).clip(lower=1e-9).to_numpy()
+        pesos = 1 / varianza
+    else:
+        pesos = np.ones(S.shape[0])
+    # Hojas conciliadas = (S'W⁻¹S)⁻¹ S'W⁻¹ ŷ; la matriz se aplica como operador sin formarla
+    ST = S.T.tocsr()
+    A = LinearOperator((n_hojas, n_hojas), matvec=lambda x: ST @ (pesos * (S @ x)), dtype=float)
+    diagonal = ST @ pesos
+    M = LinearOperator((n_hojas, n_hojas), matvec=lambda x: x / diagonal, dtype=float)
+    hojas = np.column_stack([cg(A, ST @ (pesos * fila), M=M)[0] for fila in base])
+    return (S @ hojas).T
+
+
+def pronostico_jerarquico(padre, horiz, metodo="mint"):
+    """Historia, pronóstico base y pronóstico conciliado de todos los nodos de la jerarquía."""
+    arbol = estructura(padre)
+    base, varianza = _base(padre, horiz, backend(), version_fuente())
+    with medir(f"conciliar[{metodo}]"):
+        coherente = conciliar(arbol["S"], base.to_numpy(), metodo, varianza)
+    return {
+        **arbol,
+        "base": base,
+        "conciliado": pd.DataFrame(coherente, index=base.index, columns=base.columns),
+    }
+
+
+def hijos(arbol, nodo):
+    """Nodos hijos de `nodo` (vacío para las hojas)."""
+    if nodo == TOTAL:
+        return arbol["padres"]
+    if nodo in arbol["padres"]:
+        prefijo = f"{nodo}{SEPARADOR}"
+        return [n for n in arbol["nombres"] if n.startswith(prefijo)]
+    return []
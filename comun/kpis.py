@@ -0,0 +1,105 @@
+import pandas as pd
+
+from comun.cache import cacheado
+from comun.consultas import agregar
+
+MEDIDAS_KPI = (
+    ("cantidad", "cantidad", "sum"),
+    ("ordenes", "orden", "count"),
+    ("total", "total", "sum"),
+    ("utilidad", "utilidad", "sum"),
+)
+DIMENSIONES_CUBO = ("anio", "mes", "pais", "categoria")
+COMPARACIONES = {
+    "mes_anterior": "Mes anterior",
+    "interanual": "Mismo mes del año anterior",
+    "doce_meses": "Últimos 12 meses",
+}
+
+
+def _utilidad_porcent(df):
+    df["utilidad_porcent"] = (df["utilidad"] / df["total"].where(df["total"] != 0) * 100).fillna(0)
+    return df
+
+
+@cacheado("analisis", "cubo_kpis")
+def cubo_kpis():
+    """KPIs agregados por (anio, mes, pais, categoria), con el índice ordenado.
+
+    Se calcula una vez por versión de datos y es chico (años × meses × países ×
+    categorías): cada período de una comparación es un corte del índice en lugar de
+    volver a filtrar las transacciones.
+    """
+    return agregar(list(DIMENSIONES_CUBO), MEDIDAS_KPI).set_index(list(DIMENSIONES_CUBO)).sort_index()
+
+
+def mes_anterior(anio, mes, meses=1):
+    """(anio, mes) que está `meses` meses antes; enero retrocede a diciembre del año previo."""
+    indice = anio * 12 + mes - 1 - meses
+    return indice // 12, indice % 12 + 1
+
+
+def periodos_comparacion(anio, mes, modo="mes_anterior"):
+    """Listas de (anio, mes) del período actual y del de referencia según `modo`.
+
+    mes_anterior: el mes contra el anterior; interanual: el mes contra el mismo mes
+    del año previo; doce_meses: los 12 meses que terminan en el mes contra los 12 previos.
+    """
+    if modo == "mes_anterior":
+        return [(anio, mes)], [mes_anterior(anio, mes)]
+    if modo == "interanual":
+        return [(anio, mes)], [(anio - 1, mes)]
+    if modo == "doce_meses":
+        actual = [mes_anterior(anio, mes, k) for k in range(11, -1, -1)]
+        return actual, [mes_anterior(a, m, 12) for a, m in actual]
+    raise ValueError(f"Modo de comparación desconocido: {modo}")
+
+
+def etiqueta_periodos(periodos):
+    """Texto "2024-05" o "2023-06 a 2024-05" para una lista ordenada de (anio, mes)."""
+    inicio, fin = (f"{anio}-{mes:02d}" for anio, mes in (periodos[0], periodos[-1]))
+    return inicio if inicio == fin else f"{inicio} a {fin}"
+
+
+def _seleccion(cubo, periodos, paises=()):
+    # Cada (anio, mes) es una búsqueda en el índice; los períodos sin ventas se omiten
+    partes = []
+    for periodo in periodos:
+        try:
+            partes.append(cubo.loc[periodo])
+        except KeyError:
+            continue
+    if not partes:
+        return cubo.iloc[:0].droplevel(["anio", "mes"])
+    df = pd.concat(partes)
+    if paises:
+        df = df[df.index.get_level_values("pais").isin(paises)]
+    return df
+
+
+def kpis_comparados(anio, mes, modo="mes_anterior", paises=()):
+    """KPIs del período actual y del de referencia (filas "actual" y "referencia").
+
+    Columnas: cantidad (productos vendidos), ordenes, total (ventas), utilidad y
+    utilidad_porcent (utilidad sobre ventas, en %). Los períodos sin ventas suman 0.
+    """
+    cubo = cubo_kpis()
+    actual, referencia = periodos_comparacion(anio, mes, modo)
+    df = pd.DataFrame({
+        "actual": _seleccion(cubo, actual, paises).sum(),
+        "referencia": _seleccion(cubo, referencia, paises).sum(),
+    }).T
+    return _utilidad_porcent(df)
+
+
+def variacion_categorias(anio, mes, modo="mes_anterior", paises=()):
+    """Total por categoría en ambos períodos, con la variación absoluta y porcentual."""
+    cubo = cubo_kpis()
+    actual, referencia = periodos_comparacion(anio, mes, modo)
+    df = pd.DataFrame({
+        "actual": _seleccion(cubo, actual, paises)["total"].groupby(level="categoria").sum(),
+        "referencia": _seleccion(cubo, referencia, paises)["total"].groupby(level="categoria").sum(),
+    }).fillna(0)
+    df["variacion"] = df["actual"] - df["referencia"]
+    df["variacion_porcent"] = (df["variacion"] / df["referencia"].where(df["referencia"] != 0) * 100)
+    return df.rename_axis("categoria").reset_index().sort_values("variacion", ascending=False)
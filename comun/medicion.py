@@ -0,0 +1,137 @@
+"""Instrumentación liviana de las etapas de cada rerun (tiempo de pared y pico de memoria).
+
+Se activa con PERFILAR=1 o con `?perfil=1` en la URL; desactivada, `medir` no hace nada.
+La URL solo habilita los tiempos: el pico de memoria (tracemalloc) requiere PERFILAR=1,
+para que un visitante no deje el rastreo encendido para todo el servidor.
+Cada página abre el registro con `iniciar_rerun` y lo muestra con `panel_mediciones`,
+que además permite descargarlo como JSON lines y, si PERFIL_JSONL apunta a un archivo,
+lo agrega ahí para análisis offline.
+
+El pico de memoria sale de tracemalloc, que es global al proceso: con varias sesiones
+ejecutando a la vez es una cota superior de lo que asignó la etapa.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+
+ACTIVO = os.environ.get("PERFILAR", "0") == "1"
+RUTA_JSONL = os.environ.get("PERFIL_JSONL")
+CLAVE = "_mediciones"
+
+_local = threading.local()
+_bloqueo_archivo = threading.Lock()
+
+
+def activo():
+    if ACTIVO:
+        return True
+    try:
+        return st.query_params.get("perfil") == "1"
+    except Exception:
+        return False
+
+
+def _registro():
+    # Fuera del hilo del script (p. ej. el precalentado de modelos) no hay sesión
+    try:
+        return st.session_state.get(CLAVE)
+    except Exception:
+        return None
+
+
+def iniciar_rerun(pagina):
+    """Abre un registro vacío para el rerun actual de `pagina`."""
+    if not activo():
+        st.session_state.pop(CLAVE, None)
+        return
+    if ACTIVO and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    st.session_state[CLAVE] = {
+        "rerun": uuid.uuid4().hex[:8],
+        "pagina": pagina,
+        "inicio": time.time(),
+        "etapas": [],
+    }
+
+
+@contextmanager
+def medir(etapa):
+    """Mide el bloque como `etapa` dentro del rerun actual (anidable)."""
+    registro = _registro()
+    if registro is None:
+        yield
+        return
+    memoria = ACTIVO and tracemalloc.is_tracing()
+    # Pila de picos: una etapa anidada reinicia el pico y se lo devuelve a la que la contiene
+    pila = _local.__dict__.setdefault("pila", [])
+    pila.append(0)
+    base = tracemalloc.get_traced_memory()[0] if memoria else 0
+    if memoria:
+        tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        pico = max(tracemalloc.get_traced_memory()[1] if memoria else 0, pila.pop())
+        if pila:
+            pila[-1] = max(pila[-1], pico)
+        registro["etapas"].append({
+            "etapa": etapa,
+            "nivel": len(pila),
+            "segundos": round(segundos, 6),
+            "pico_mb": round(max(pico - base, 0) / 2**20, 3) if memoria else None,
+        })
+
+
+def medido(etapa=None):
+    """Decorador equivalente a envolver la función en `medir(etapa)`."""
+    def decorar(funcion):
+        nombre = etapa or funcion.__name__
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorar
+
+
+def lineas_jsonl(registro):
+    comunes = {"rerun": registro["rerun"], "pagina": registro["pagina"], "inicio": registro["inicio"]}
+    return "".join(json.dumps({**comunes, **etapa}, ensure_ascii=False) + "\n" for etapa in registro["etapas"])
+
+
+def exportar_jsonl(registro, ruta=RUTA_JSONL):
+    if not ruta or not registro["etapas"]:
+        return
+    with _bloqueo_archivo, open(ruta, "a", encoding="utf-8") as archivo:
+        archivo.write(lineas_jsonl(registro))
+
+
+def panel_mediciones():
+    """Panel de depuración en la barra lateral con las etapas medidas en este rerun."""
+    registro = _registro()
+    if registro is None:
+        return
+    exportar_jsonl(registro)
+    with st.sidebar.expander("Depuración: tiempos por etapa", icon=":material/timer:"):
+        if not registro["etapas"]:
+            st.caption("No se midieron etapas en este rerun.")
+            return
+        st.dataframe(registro["etapas"], hide_index=True)
+        st.caption(f"Rerun {registro['rerun']}: {time.time() - registro['inicio']:.2f} s en total")
+        st.download_button(
+            label="Exportar JSONL",
+            data=lineas_jsonl(registro),
+            file_name=f"mediciones_{registro['pagina']}_{registro['rerun']}.jsonl",
+            mime="application/x-ndjson",
+            key="exportar_mediciones",
+        )
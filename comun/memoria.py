@@ -0,0 +1,66 @@
+"""Diagnóstico de memoria: proceso, dataset compartido, cachés y estado de cada sesión.
+
+El panel se muestra con `?admin=1` o ADMIN_CACHE=1, igual que el de la caché. La memoria
+por sesión es una estimación: lo que queda del RSS del proceso después de restar el
+dataset compartido y las cachés, dividido por las sesiones activas.
+"""
+import os
+import sys
+
+import pandas as pd
+import streamlit as st
+
+from comun.cache import CACHE, admin_visible, tamano
+from comun.consultas import backend
+from comun.datos import RUTA_DATOS, _leer_ventas, hay_particiones, version_datos
+
+
+def rss_proceso():
+    """Memoria residente actual del proceso en bytes (el pico si no hay /proc; None en Windows)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def sesiones_activas():
+    try:
+        from streamlit.runtime import Runtime
+
+        return Runtime.instance()._session_mgr.num_active_sessions()
+    except Exception:
+        return None
+
+
+def diagnostico():
+    megas = 2**20
+    # Con particiones o DuckDB no hay DataFrame compartido: no se carga el Excel solo para medirlo
+    compartido = 0 if hay_particiones() or backend() == "duckdb" else tamano(_leer_ventas(str(RUTA_DATOS), version_datos(RUTA_DATOS)))
+    sesion = sum(tamano(valor) for valor in st.session_state.to_dict().values())
+    rss = rss_proceso()
+    sesiones = sesiones_activas()
+    cache = CACHE.estadisticas()["MB usados"] * megas
+    por_sesion = (rss - compartido - cache) / sesiones if rss and sesiones else None
+    return {
+        "RSS del proceso (MB)": round(rss / megas, 1) if rss else None,
+        "dataset compartido (MB)": round(compartido / megas, 1),
+        "caché de resultados (MB)": round(cache / megas, 1),
+        "sesiones activas": sesiones,
+        "estimado por sesión (MB)": round(por_sesion / megas, 1) if por_sesion is not None else None,
+        "estado de esta sesión (KB)": round(sesion / 1024, 1),
+    }
+
+
+def panel_memoria():
+    """Panel de diagnóstico de memoria."""
+    if not admin_visible():
+        return
+    with st.sidebar.expander("Administración: memoria", icon=":material/monitor_heart:"):
+        st.dataframe(pd.Series(diagnostico(), name="valor").astype(str), use_container_width=True)
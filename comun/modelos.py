@@ -0,0 +1,44 @@
+import importlib
+import threading
+from functools import lru_cache
+
+# Backends de modelos: nombre → (módulo, clase). El framework se importa recién
+# cuando se entrena el primer modelo de ese tipo.
+REGISTRO = {
+    "xgboost": ("xgboost", "XGBRegressor"),
+    "tabpfn": ("tabpfn", "TabPFNRegressor"),
+    "nbeats": ("darts.models", "NBEATSModel"),
+    "timeseries": ("darts", "TimeSeries"),
+}
+
+_bloqueo = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _importar(nombre):
+    modulo, clase = REGISTRO[nombre]
+    # Evita que dos sesiones importen torch al mismo tiempo
+    with _bloqueo:
+        return getattr(importlib.import_module(modulo), clase)
+
+
+def cargar_modelo(nombre):
+    """Devuelve la clase del backend `nombre`, importándola la primera vez."""
+    if nombre not in REGISTRO:
+        raise KeyError(f"Modelo desconocido: {nombre}")
+    return _importar(nombre)
+
+
+def precalentar(nombres=None):
+    """Importa los backends en un hilo en segundo plano para ocultar el costo de la primera carga."""
+    def _cargar():
+        for nombre in nombres or REGISTRO:
+            try:
+                _importar(nombre)
+            except ImportError:
+                # El backend no está instalado: se informará al intentar entrenar
+                pass
+
+    hilo = threading.Thread(target=_cargar, name="precalentar-modelos", daemon=True)
+    hilo.start()
+    return hilo
@@ -0,0 +1,28 @@
+import hashlib
+from functools import lru_cache
+
+# Saturación y luminosidad por dimensión; el tono sale del hash del valor
+TONOS = {
+    "pais": (65, 75),
+    "ciudad": (55, 60),
+    "categoria": (60, 65),
+    "producto": (50, 55),
+}
+
+
+@lru_cache(maxsize=4096)
+def color_estable(valor, dimension, alfa=1.0):
+    """Color HSLA determinista para un valor categórico.
+
+    El mismo valor recibe siempre el mismo color en todas las páginas y en todas
+    las ejecuciones, de modo que las figuras sin cambios generan el mismo payload.
+    """
+    saturacion, luminosidad = TONOS.get(dimension, (60, 60))
+    resumen = hashlib.md5(f"{dimension}:{valor}".encode()).digest()
+    tono = int.from_bytes(resumen[:4], "big") % 360
+    return f"hsla({tono},{saturacion}%,{luminosidad}%,{alfa})"
+
+
+def mapa_colores(valores, dimension, alfa=1.0):
+    """Diccionario valor → color para usar con `Series.map` o `color_discrete_map`."""
+    return {valor: color_estable(valor, dimension, alfa) for valor in dict.fromkeys(valores)}
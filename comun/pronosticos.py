@@ -0,0 +1,289 @@
+"""Entrenamiento de los pronósticos y almacén de resultados precalculados.
+
+`python -m comun.pronosticos` entrena en paralelo todas las combinaciones de escenario
+(país o categoría), entidad y horizonte (2, 3 y 6) de las páginas de predicción y guarda
+pronósticos, intervalos y métricas en SQLite (`datos/pronosticos.sqlite` o la ruta de
+PRONOSTICOS). Cada resultado queda asociado a la versión de los datos y de los modelos
+con la que se entrenó: las páginas lo leen si ambas coinciden con las vigentes y, si no,
+entrenan en vivo.
+"""
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from comun import modelos
+from comun.cache import cacheado
+from comun.caracteristicas import panel_mensual, pronostico_xgb
+from comun.consultas import agregar, valores_distintos, version_fuente
+from comun.datos import RAIZ
+from comun.medicion import medido, medir
+
+RUTA_ALMACEN = Path(os.environ.get("PRONOSTICOS", RAIZ / "datos" / "pronosticos.sqlite"))
+HORIZONTES = (2, 3, 6)
+COLUMNAS = ("pais", "categoria")
+GRUPOS = ("fecha", "mes")
+FRECUENCIAS = {"fecha": "D", "mes": "MS"}
+# Se incrementa al cambiar los modelos, sus características o las columnas guardadas:
+# los resultados de versiones anteriores dejan de servirse sin tener que borrar el almacén
+VERSION_MODELOS = 2
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pronosticos (
+    version TEXT, modelo TEXT, columna TEXT, entidad TEXT, grupo TEXT, horizonte INTEGER,
+    fecha TEXT, real REAL, prediccion REAL, q10 REAL, q90 REAL
+);
+CREATE INDEX IF NOT EXISTS ix_pronosticos ON pronosticos (version, columna, entidad, grupo, horizonte);
+CREATE TABLE IF NOT EXISTS metricas (
+    version TEXT, modelo TEXT, columna TEXT, entidad TEXT, grupo TEXT, horizonte INTEGER, mae REAL
+);
+"""
+
+
+# ---------------- series ----------------
+def serie_mensual(filtro, columna):
+    """Total mensual de la entidad `filtro` con las variables de calendario del modelo.
+
+    Sale del panel de todas las entidades, así que todas las series terminan en el mismo
+    mes (los meses sin ventas cuentan como 0) y comparten el corte de prueba del XGBoost global.
+    """
+    df_ag = panel_mensual(columna)[filtro].dropna().rename("Value").to_frame()
+    df_ag.index.name = "Date"
+    df_ag["month"] = df_ag.index.month
+    df_ag["run_idx"] = np.arange(len(df_ag)) / len(df_ag)
+    return df_ag
+
+
+def series_agrupadas(columna, grupo):
+    """Total por entidad y período (día o inicio de mes) en formato unique_id/ds/y."""
+    periodo = "periodo_mes" if grupo == "mes" else "periodo_dia"
+    df = (
+        agregar([columna, periodo], [("y", "total", "sum")])
+        .rename(columns={columna: "unique_id", periodo: "ds"})
+    )
+    df["y"] = df["y"].astype("float32")
+    return df
+
+
+# ---------------- entrenamiento ----------------
+@cacheado("prediccion", "tabpfn")
+def entrenar_mensual(df_model, nombre, horiz, columna):
+    """TabPFN y XGBoost sobre los últimos `horiz` meses como conjunto de prueba.
+
+    TabPFN se ajusta a la serie de la entidad; XGBoost es el modelo global con rezagos
+    y ventanas móviles de `comun.caracteristicas`, compartido por todas las entidades de
+    `columna` (se entrena una vez por horizonte y versión de datos).
+    """
+    train, test = df_model.iloc[:-horiz], df_model.iloc[-horiz:]
+    X_tr, y_tr = train.drop(columns="Value"), train["Value"]
+    X_te, y_te = test.drop(columns="Value"), test["Value"]
+
+    y_xgb = pronostico_xgb(columna, horiz)[nombre].reindex(y_te.index).to_numpy()
+
+    # Los frameworks se importan recién al entrenar
+    TabPFNRegressor = modelos.cargar_modelo("tabpfn")
+
+    tab = TabPFNRegressor(device="cpu", ignore_pretraining_limits=True)
+    with medir("tabpfn.fit"):
+        tab.fit(X_tr.values, y_tr.values)
+    with medir("tabpfn.predict"):
+        y_tab = tab.predict(X_te.values, output_type="median")
+        q10, q90 = tab.predict(X_te.values, output_type="quantiles", quantiles=[0.1, 0.9])
+
+    return {
+        "nombre": nombre,
+        "index": df_model.index,
+        "valores": df_model["Value"],
+        "fechas_pred": y_te.index,
+        "tab_median": y_tab,
+        "tab_q10": q10,
+        "tab_q90": q90,
+        "xgb": y_xgb,
+        "y_te": y_te
+    }
+
+
+@medido()
+def crear_timeseries(df, time_col="ds", value_col="y", frecuencia_sugerida="D"):
+    try:
+        TimeSeries = modelos.cargar_modelo("timeseries")
+        df = df.sort_values(by=time_col).copy()
+        freq_inferida = pd.infer_freq(df[time_col])
+        ts = TimeSeries.from_dataframe(
+            df,
+            time_col=time_col,
+            value_cols=value_col,
+            fill_missing_dates=True,
+            freq=freq_inferida or frecuencia_sugerida
+        )
+        return ts
+    except Exception as e:
+        raise ValueError(f"Error al crear la TimeSeries: {e}")
+
+
+@cacheado("nbeats", "nbeats")
+def entrenar_nbeats(df_entidad, grupo, horizonte):
+    """Entrena N-BEATS sobre la serie de la entidad y pronostica `horizonte` períodos."""
+    ts = crear_timeseries(df_entidad, time_col="ds", value_col="y", frecuencia_sugerida=FRECUENCIAS[grupo])
+    NBEATSModel = modelos.cargar_modelo("nbeats")
+    modelo = NBEATSModel(
+        input_chunk_length=30 if grupo == "fecha" else 12,
+        output_chunk_length=horizonte,
+        n_epochs=300,
+        random_state=42,
+    )
+    with medir("modelo.fit"):
+        modelo.fit(ts)
+    with medir("modelo.predict"):
+        pred = modelo.predict(horizonte)
+    return pd.DataFrame({"ds": pred.time_index, "predicción": pred.values().flatten()})
+
+
+# ---------------- almacén ----------------
+def _conectar(ruta=RUTA_ALMACEN, escritura=False):
+    if escritura:
+        conexion = sqlite3.connect(ruta)
+        conexion.executescript(ESQUEMA)
+        return conexion
+    return sqlite3.connect(f"file:{ruta}?mode=ro", uri=True)
+
+
+def _version_almacen():
+    return f"{version_fuente()}|modelos-{VERSION_MODELOS}"
+
+
+def _leer(modelo, columna, entidad, grupo, horizonte, ruta=RUTA_ALMACEN):
+    if not Path(ruta).exists():
+        return None
+    try:
+        with closing(_conectar(ruta)) as conexion:
+            df = pd.read_sql_query(
+                "SELECT fecha, real, prediccion, q10, q90 FROM pronosticos WHERE version = ? AND modelo = ? "
+                "AND columna = ? AND entidad = ? AND grupo = ? AND horizonte = ? ORDER BY fecha",
+                conexion,
+                params=(_version_almacen(), modelo, columna, str(entidad), grupo, int(horizonte)),
+                parse_dates=["fecha"],
+            )
+    except sqlite3.Error:
+        return None
+    return df if len(df) else None
+
+
+def leer_mensual(columna, entidad, horizonte):
+    """Resultado precalculado de TabPFN/XGBoost con las claves de `entrenar_mensual`, o None."""
+    tab = _leer("tabpfn", columna, entidad, "mes", horizonte)
+    xgb = _leer("xgboost", columna, entidad, "mes", horizonte)
+    if tab is None or xgb is None:
+        return None
+    fechas = pd.DatetimeIndex(tab["fecha"], name="Date")
+    return {
+        "fechas_pred": fechas,
+        "tab_median": tab["prediccion"].to_numpy(),
+        "tab_q10": tab["q10"].to_numpy(),
+        "tab_q90": tab["q90"].to_numpy(),
+        "xgb": xgb["prediccion"].to_numpy(),
+        "y_te": pd.Series(tab["real"].to_numpy(), index=fechas, name="Value"),
+    }
+
+
+def leer_nbeats(columna, entidad, grupo, horizonte):
+    """Pronóstico N-BEATS precalculado (ds, predicción), o None."""
+    df = _leer("nbeats", columna, entidad, grupo, horizonte)
+    if df is None:
+        return None
+    return pd.DataFrame({"ds": df["fecha"], "predicción": df["prediccion"]})
+
+
+def _filas_mensual(columna, horizonte, resultado):
+    fechas = [f.isoformat() for f in resultado["fechas_pred"]]
+    real = np.asarray(resultado["y_te"], dtype=float)
+    comunes = ("mes", horizonte)
+    for fecha, r, p, q10, q90 in zip(fechas, real, resultado["tab_median"], resultado["tab_q10"], resultado["tab_q90"]):
+        yield ("tabpfn", columna, str(resultado["nombre"]), *comunes, fecha, r, float(p), float(q10), float(q90))
+    for fecha, r, p in zip(fechas, real, resultado["xgb"]):
+        yield ("xgboost", columna, str(resultado["nombre"]), *comunes, fecha, r, float(p), None, None)
+
+
+def _metricas_mensual(columna, horizonte, resultado):
+    real = np.asarray(resultado["y_te"], dtype=float)
+    for modelo, prediccion in (("tabpfn", resultado["tab_median"]), ("xgboost", resultado["xgb"])):
+        mae = float(np.mean(np.abs(real - np.asarray(prediccion, dtype=float))))
+        yield (modelo, columna, str(resultado["nombre"]), "mes", horizonte, mae)
+
+
+# ---------------- proceso por lotes ----------------
+def _tarea_mensual(columna, entidad, horizonte, df_model):
+    return "mensual", columna, entidad, "mes", horizonte, entrenar_mensual(df_model, entidad, horizonte, columna)
+
+
+def _tarea_nbeats(columna, entidad, grupo, horizonte, df_entidad):
+    return "nbeats", columna, entidad, grupo, horizonte, entrenar_nbeats(df_entidad, grupo, horizonte)
+
+
+def _tareas():
+    for columna in COLUMNAS:
+        for entidad in valores_distintos(columna):
+            df_model = serie_mensual(entidad, columna)
+            for horizonte in HORIZONTES:
+                if len(df_model) >= horizonte + 4:
+                    yield _tarea_mensual, (columna, entidad, horizonte, df_model)
+        for grupo in GRUPOS:
+            df_grouped = series_agrupadas(columna, grupo)
+            for entidad, df_entidad in df_grouped.groupby("unique_id", sort=False):
+                for horizonte in HORIZONTES:
+                    yield _tarea_nbeats, (columna, entidad, grupo, horizonte, df_entidad.sort_values("ds"))
+
+
+def precalcular(procesos=None, ruta=RUTA_ALMACEN):
+    """Entrena todas las combinaciones en paralelo y reemplaza el almacén de la versión vigente."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    version = _version_almacen()
+    errores = 0
+    with closing(_conectar(ruta, escritura=True)) as conexion:
+        conexion.execute("DELETE FROM pronosticos WHERE version = ?", (version,))
+        conexion.execute("DELETE FROM metricas WHERE version = ?", (version,))
+        # spawn: los workers no heredan los hilos de torch del proceso principal
+        with ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futuros = {pool.submit(tarea, *argumentos): argumentos[:-1] for tarea, argumentos in _tareas()}
+            for futuro in as_completed(futuros):
+                try:
+                    tipo, columna, entidad, grupo, horizonte, resultado = futuro.result()
+                except Exception as e:
+                    errores += 1
+                    print(f"Error en {futuros[futuro]}: {e}")
+                    continue
+                if tipo == "mensual":
+                    filas = list(_filas_mensual(columna, horizonte, resultado))
+                    metricas = list(_metricas_mensual(columna, horizonte, resultado))
+                else:
+                    filas = [("nbeats", columna, str(entidad), grupo, horizonte, ds.isoformat(), None, float(p), None, None)
+                             for ds, p in zip(resultado["ds"], resultado["predicción"])]
+                    metricas = []
+                conexion.executemany("INSERT INTO pronosticos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                     [(version, *fila) for fila in filas])
+                conexion.executemany("INSERT INTO metricas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     [(version, *fila) for fila in metricas])
+                conexion.commit()
+        # Los resultados de versiones anteriores ya no se pueden servir
+        conexion.execute("DELETE FROM pronosticos WHERE version != ?", (version,))
+        conexion.execute("DELETE FROM metricas WHERE version != ?", (version,))
+        conexion.commit()
+    return len(futuros), errores
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # Las tareas se envían a los workers desde el módulo importado, no desde __main__
+    from comun.pronosticos import RUTA_ALMACEN, precalcular
+
+    parser = argparse.ArgumentParser(description="Precalcula los pronósticos de las páginas de predicción.")
+    parser.add_argument("--procesos", type=int, default=max((os.cpu_count() or 2) // 2, 1), help="Procesos de entrenamiento en paralelo")
+    args = parser.parse_args()
+    total, errores = precalcular(args.procesos)
+    print(f"{total - errores} de {total} pronósticos guardados en {RUTA_ALMACEN}")
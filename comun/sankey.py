@@ -0,0 +1,72 @@
+import pandas as pd
+import plotly.graph_objects as go
+
+from comun.consultas import agregar
+from comun.medicion import medido
+
+
+@medido("sankey.tabla")
+def tabla_sankey(origen, destino, valor, filtros=()):
+    """Tabla agregada origen → destino (cacheada por `agregar` según filtros y versión de datos)."""
+    return agregar([origen, destino], [(valor, valor, "sum")], filtros)
+
+
+def podar_enlaces(df_agg, origen, destino, valor, top_n=None, cuota=None, etiqueta_otros="Otros"):
+    """Conserva los enlaces principales de cada nodo origen y agrupa el resto en "Otros".
+
+    Por cada valor de `origen` se mantienen los `top_n` enlaces de mayor `valor`
+    y/o los enlaces necesarios para cubrir la `cuota` (0-1) del total del origen.
+    Los enlaces descartados se suman en un único enlace origen → `etiqueta_otros`,
+    de modo que el tamaño del Sankey queda acotado aunque crezca la cardinalidad.
+    """
+    if not top_n and not cuota:
+        return df_agg
+
+    df = df_agg.sort_values([origen, valor], ascending=[True, False])
+    grupos = df.groupby(origen, sort=False)[valor]
+    mantener = pd.Series(True, index=df.index)
+
+    if top_n:
+        mantener &= df.groupby(origen, sort=False).cumcount() < top_n
+
+    if cuota:
+        total = grupos.transform("sum")
+        # Valor acumulado antes de cada enlace: el primero siempre se conserva
+        previo = grupos.cumsum() - df[valor]
+        mantener &= (total <= 0) | (previo < cuota * total)
+
+    if mantener.all():
+        return df_agg
+
+    otros = df[~mantener].groupby(origen, as_index=False, sort=False)[valor].sum()
+    otros[destino] = etiqueta_otros
+    return pd.concat([df[mantener], otros], ignore_index=True)[[origen, destino, valor]]
+
+
+@medido("sankey.figura")
+def figura_sankey(df_agg, origen, destino, valor, colores, titulo, color_defecto="rgba(180,180,180,0.5)", hovertemplate=None):
+    """Construye el diagrama Sankey origen → destino de una tabla ya agregada."""
+    nodos = list(pd.unique(df_agg[origen].tolist() + df_agg[destino].tolist()))
+    mapa_indices = {nombre: i for i, nombre in enumerate(nodos)}
+
+    enlaces = dict(
+        source=df_agg[origen].map(mapa_indices),
+        target=df_agg[destino].map(mapa_indices),
+        value=df_agg[valor],
+        color=df_agg[origen].map(colores).fillna(color_defecto),
+    )
+    if hovertemplate:
+        enlaces["hovertemplate"] = hovertemplate
+
+    fig = go.Figure(data=[go.Sankey(
+        node=dict(
+            pad=15,
+            thickness=20,
+            line=dict(color="black", width=0.5),
+            label=nodos,
+            color="rgba(0,0,0,0.3)"
+        ),
+        link=enlaces
+    )])
+    fig.update_layout(title_text=titulo, height=500)
+    return fig
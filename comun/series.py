@@ -0,0 +1,76 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# A partir de este número de puntos las trazas se dibujan con WebGL
+UMBRAL_WEBGL = 2000
+
+
+def _numerico(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb(x, y, n):
+    """Índices elegidos por Largest-Triangle-Three-Buckets para conservar `n` puntos.
+
+    Mantiene el primer y el último punto y, en cada bucket intermedio, el punto que
+    forma el triángulo de mayor área con el elegido antes y el promedio del siguiente
+    bucket; así se preservan picos y forma visual de la serie.
+    """
+    largo = len(y)
+    if n >= largo or n < 3:
+        return np.arange(largo)
+    xn, yn = _numerico(x), np.asarray(y, dtype=float)
+
+    bordes = np.linspace(1, largo - 1, n - 1).astype(int)
+    indices = [0]
+    anterior = 0
+    for i in range(n - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        if i + 2 < len(bordes):
+            px, py = xn[fin:bordes[i + 2]].mean(), yn[fin:bordes[i + 2]].mean()
+        else:
+            px, py = xn[-1], yn[-1]
+        ax, ay = xn[anterior], yn[anterior]
+        areas = np.abs((ax - px) * (yn[inicio:fin] - ay) - (ax - xn[inicio:fin]) * (py - ay))
+        anterior = inicio + int(np.nanargmax(areas)) if np.isfinite(areas).any() else inicio
+        indices.append(anterior)
+    indices.append(largo - 1)
+    return np.asarray(indices)
+
+
+def minmax(y, n):
+    """Índices del mínimo y el máximo de cada bucket (n/2 buckets), en orden."""
+    largo = len(y)
+    if n >= largo or n < 2:
+        return np.arange(largo)
+    yn = np.asarray(y, dtype=float)
+    bordes = np.linspace(0, largo, n // 2 + 1).astype(int)
+    indices = []
+    for inicio, fin in zip(bordes[:-1], bordes[1:]):
+        if fin <= inicio:
+            continue
+        tramo = yn[inicio:fin]
+        if not np.isfinite(tramo).any():
+            indices.append(inicio)
+            continue
+        indices.extend(sorted({inicio + int(np.nanargmin(tramo)), inicio + int(np.nanargmax(tramo))}))
+    return np.asarray(indices)
+
+
+def reducir(x, y, max_puntos, metodo="lttb"):
+    """Reduce la serie a como mucho `max_puntos` con LTTB o min-max."""
+    x, y = np.asarray(x), np.asarray(y)
+    if not max_puntos or len(y) <= max_puntos:
+        return x, y
+    indices = lttb(x, y, max_puntos) if metodo == "lttb" else minmax(y, max_puntos)
+    return x[indices], y[indices]
+
+
+def trazo_linea(x, y, max_puntos=None, metodo="lttb", **kwargs):
+    """Traza de línea reducida en el servidor; usa Scattergl si sigue siendo grande."""
+    x, y = reducir(x, y, max_puntos, metodo)
+    clase = go.Scattergl if len(y) > UMBRAL_WEBGL else go.Scatter
+    return clase(x=x, y=y, **kwargs)
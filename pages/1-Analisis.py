@@ -1,10 +1,23 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+import calendar
 import io
+import os
+import tempfile
+from datetime import date
 from fpdf import FPDF
 import plotly.io as pio
 from PIL import Image
+from comun.cache import panel_cache
+from comun.coalescencia import compartir
+from comun.consultas import agregar, esquema_filas, lotes_filas, valores_distintos, version_fuente
+from comun.datos import filtros_transacciones, filtros_ventas
+from comun.estilo import aplicar_estilo, pie_de_pagina
+from comun.exportar import DESCARGA_MAX_MB, FORMATOS, archivo_exportacion, url_transacciones
+from comun.kpis import COMPARACIONES, etiqueta_periodos, kpis_comparados, periodos_comparacion, variacion_categorias
+from comun.medicion import iniciar_rerun, medido, medir, panel_mediciones
+from comun.memoria import panel_memoria
+from comun.paleta import mapa_colores
 
 
 st.set_page_config(
@@ -14,42 +27,33 @@ st.set_page_config(
     initial_sidebar_state="expanded" 
 )
 
-def apply_custom_style():
-    css_file = "asset/styles.css"
-    try:
-        with open(css_file) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    except FileNotFoundError:
-        st.error(f"No se encontró el archivo de estilo: {css_file}", icon=":material/cancel:")
-apply_custom_style()
+aplicar_estilo()
+iniciar_rerun("analisis")
 
 
-dfDatos = pd.read_excel("datos/db-datos.xlsx")
-
 with st.sidebar:
-    parAno=st.selectbox('Año',options=dfDatos['anio'].unique(),index=0)    
-
-    parMes = st.selectbox('Mes',options=dfDatos['mes'].unique(),index=0)    
+    parAno=st.selectbox('Año',options=valores_distintos('anio'),index=0)    
 
-    parPais = st.multiselect('País',options=dfDatos['pais'].unique())
+    parMes = st.selectbox('Mes',options=valores_distintos('mes'),index=0)    
 
-if parAno:   
-    dfDatos=dfDatos[dfDatos['anio']==parAno]
+    parPais = st.multiselect('País',options=valores_distintos('pais'))
 
-if parMes:    
-    dfDatos=dfDatos[dfDatos['mes']<=parMes]
+    parComparacion = st.radio('Comparar con',options=list(COMPARACIONES),format_func=COMPARACIONES.get,key='comparacion')
 
-if len(parPais)>0:
-    dfDatos=dfDatos[dfDatos['pais'].isin(parPais)]
+# Las agregaciones se resuelven en el backend de consultas (pandas o DuckDB) con estos filtros
+filtros = filtros_ventas(anio=parAno, mes_hasta=parMes, paises=parPais)
 
+filtrosMesActual = filtros + (('mes','==',parMes),)
 
-dfMesActual = dfDatos[dfDatos['mes']==parMes]
+TOTAL = (('total','total','sum'),)
+# KPIs del período y del de referencia (mes anterior, mismo mes del año previo o 12 meses),
+# leídos del agregado indexado por (anio, mes, pais, categoria)
+with medir('kpis'):
+    dfKpi = kpis_comparados(parAno, parMes, parComparacion, tuple(parPais))
 
-if parMes: 
-    if parMes>1:         
-        dfMesAnterior = dfDatos[dfDatos['mes']==parMes-1]
-    else: 
-        dfMesAnterior = dfDatos[dfDatos['mes']==parMes]
+kpiAct = dfKpi.loc['actual']
+kpiAnt = dfKpi.loc['referencia']
+periodoAct, periodoRef = periodos_comparacion(parAno, parMes, parComparacion)
 
 st.header('Tienda de Productos Tecnológicos')
 st.subheader('Dashboard de Análisis de ventas')
@@ -65,29 +69,31 @@ else:
 #else:
 #    st.subheader(f'País seleccionado : {parPais} ')    
 
+st.caption(f'Período: {etiqueta_periodos(periodoAct)} — comparado con: {etiqueta_periodos(periodoRef)}')
+
 c1,c2,c3,c4,c5 = st.columns(5)
 
 with c1:    
-    productosAct= dfMesActual['cantidad'].sum()    
-    productosAnt= dfMesAnterior['cantidad'].sum()    
+    productosAct= kpiAct['cantidad']    
+    productosAnt= kpiAnt['cantidad']    
     variacion=productosAnt-productosAct 
     st.metric(f"Productos vendidos",f'{productosAct:,.0f} unidades', f'{variacion:,.0f}')
 
 with c2:    
-    ordenesAct= dfMesActual['orden'].count()    
-    ordenesAnt= dfMesAnterior['orden'].count()    
+    ordenesAct= kpiAct['ordenes']    
+    ordenesAnt= kpiAnt['ordenes']    
     variacion=ordenesAct-ordenesAnt
     st.metric(f"Ventas realizadas",f'{ordenesAct:.0f}', f'{variacion:.1f}')
 
 with c3:    
-    ventasAct= dfMesActual['total'].sum()    
-    ventasAnt= dfMesAnterior['total'].sum()   
+    ventasAct= kpiAct['total']    
+    ventasAnt= kpiAnt['total']   
     variacion=ventasAct-ventasAnt
     st.metric(f"Ventas totales",f'$ {ventasAct:,.0f}', f'{variacion:,.0f}')
 
 with c4:    
-    utilidadAct= dfMesActual['utilidad'].sum()    
-    utilidadAnt= dfMesAnterior['utilidad'].sum()    
+    utilidadAct= kpiAct['utilidad']    
+    utilidadAnt= kpiAnt['utilidad']    
     variacion=utilidadAct-utilidadAnt
     st.metric(f"Utilidades",f'$ {utilidadAct:,.0f}', f'{variacion:,.0f}')
 
@@ -100,29 +106,34 @@ with c5:
 c1,c2 = st.columns([0.6,0.4]) 
 
 with c1:
-    dfVentasMes = dfDatos.groupby('mes').agg({'total':'sum'}).reset_index()
+    dfVentasMes = agregar(['mes'], TOTAL, filtros)
     fig1 = px.line(dfVentasMes,x='mes',y='total', title='Ventas por mes',color_discrete_sequence=px.colors.qualitative.Plotly)    
     st.plotly_chart(fig1,use_container_width=True)
 
 with c2:
-    dfVentasPais = dfMesActual.groupby('pais').agg({'total':'sum'}).reset_index().sort_values(by='total',ascending=False)
-    fig2 = px.bar(dfVentasPais,x='pais',y='total', title=f'Ventas por País Mes: {parMes}', color='pais',text_auto=',.0f', color_discrete_sequence=px.colors.qualitative.Plotly)
+    dfVentasPais = agregar(['pais'], TOTAL, filtrosMesActual).sort_values(by='total',ascending=False)
+    fig2 = px.bar(dfVentasPais,x='pais',y='total', title=f'Ventas por País Mes: {parMes}', color='pais',text_auto=',.0f', color_discrete_map=mapa_colores(dfVentasPais['pais'],'pais'))
     fig2.update_layout(showlegend=False)
     st.plotly_chart(fig2,use_container_width=True)
 
 c1,c2 = st.columns([0.6,0.4])
 
 with c1:
-    dfVentasCategoria = dfDatos.groupby(['mes','categoria']).agg({'total':'sum'}).reset_index()
-    fig3 = px.line(dfVentasCategoria,x='mes',y='total', title='Ventas por mes y categoría',color='categoria',color_discrete_sequence=px.colors.qualitative.Plotly)
+    dfVentasCategoria = agregar(['mes','categoria'], TOTAL, filtros)
+    fig3 = px.line(dfVentasCategoria,x='mes',y='total', title='Ventas por mes y categoría',color='categoria',color_discrete_map=mapa_colores(dfVentasCategoria['categoria'],'categoria'))
     st.plotly_chart(fig3,use_container_width=True)
 
 with c2:
-    dfVentasCategoria = dfMesActual.groupby('categoria').agg({'total':'sum'}).reset_index().sort_values(by='total',ascending=False)
-    fig4 = px.bar(dfVentasCategoria,x='categoria',y='total', title=f'Ventas por categoría Mes: {parMes}', color='categoria',text_auto=',.0f',color_discrete_sequence=px.colors.qualitative.Plotly)
+    dfVentasCategoria = agregar(['categoria'], TOTAL, filtrosMesActual).sort_values(by='total',ascending=False)
+    fig4 = px.bar(dfVentasCategoria,x='categoria',y='total', title=f'Ventas por categoría Mes: {parMes}', color='categoria',text_auto=',.0f',color_discrete_map=mapa_colores(dfVentasCategoria['categoria'],'categoria'))
     fig4.update_layout(showlegend=False) 
     st.plotly_chart(fig4,use_container_width=True)
 
+dfVariacion = variacion_categorias(parAno, parMes, parComparacion, tuple(parPais))
+fig5 = px.bar(dfVariacion,x='categoria',y='variacion', title=f'Variación de ventas por categoría ({COMPARACIONES[parComparacion].lower()})', color='categoria',text_auto=',.0f',color_discrete_map=mapa_colores(dfVariacion['categoria'],'categoria'), hover_data=['actual','referencia','variacion_porcent'])
+fig5.update_layout(showlegend=False)
+st.plotly_chart(fig5,use_container_width=True)
+
 #------------------ generar los archivos para descargar el informe en pdf ----------------
 # Función auxiliar para guardar figuras Plotly como imágenes en memoria
 def fig_to_image(fig):
@@ -130,6 +141,7 @@ def fig_to_image(fig):
     return Image.open(io.BytesIO(img_bytes))
 
 # Función para generar PDF
+@medido('generar_pdf')
 def generar_pdf():
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -152,12 +164,14 @@ def generar_pdf():
         img.save(buffered, format="PNG")
         img_bytes = buffered.getvalue()
 
-        # Guardar temporalmente imagen
-        img_path = "temp_chart.png"
-        with open(img_path, "wb") as f:
+        # Imagen temporal propia de esta generación (otros PDFs pueden estar generándose a la vez)
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
             f.write(img_bytes)
-
-        pdf.image(img_path, w=180)
+            img_path = f.name
+        try:
+            pdf.image(img_path, w=180)
+        finally:
+            os.remove(img_path)
         pdf.ln(10)
 
     # Agregar tabla con datos resumidos (mes actual)
@@ -166,43 +180,71 @@ def generar_pdf():
     pdf.set_font("Arial", '', 10)
     pdf.ln(5)
 
-    resumen = dfMesActual.groupby(['pais', 'categoria']).agg({
-        'cantidad': 'sum',
-        'total': 'sum',
-        'utilidad': 'sum'
-    }).reset_index()
+    resumen = agregar(['pais', 'categoria'], (
+        ('cantidad', 'cantidad', 'sum'),
+        ('total', 'total', 'sum'),
+        ('utilidad', 'utilidad', 'sum')
+    ), filtrosMesActual)
 
     for _, row in resumen.iterrows():
         texto = f"{row['pais']} - {row['categoria']} | Cantidad: {row['cantidad']} | Total: ${row['total']:.2f} | Utilidad: ${row['utilidad']:.2f}"
         pdf.cell(0, 8, texto, ln=True)
 
-    # Retornar archivo PDF como bytes
-    output = io.BytesIO()
-    pdf.output(output)
-    return output
+    # Retornar archivo PDF como bytes (el buffer se libera al salir)
+    with io.BytesIO() as output:
+        pdf.output(output)
+        return output.getvalue()
 # Botón de descarga
 st.write("---")
 with st.container(border=True):
     if st.button("Descargar reporte en PDF" ,icon=":material/picture_as_pdf:", key="download"):
-        pdf_file = generar_pdf()
+        # Pedidos simultáneos del mismo reporte comparten una sola generación
+        pdf_file = compartir(("pdf", parAno, parMes, tuple(parPais), version_fuente()), generar_pdf)
         st.download_button(
             label="Descargar PDF",
-            data=pdf_file.getvalue(),
+            data=pdf_file,
             file_name="reporte_ventas.pdf",               
             mime="application/pdf"
         )
 
-# --------------- footer -----------------------------
-st.write("---")
-with st.container():
-    #st.write("---")
-    st.write("&copy; - derechos reservados -  2025 -  Walter Gómez - FullStack Developer - Data Science - Business Intelligence")
-    #st.write("##")
-    left, right = st.columns(2, gap='medium', vertical_alignment="bottom")
-    with left:
-        #st.write('##')
-        st.link_button("Mi LinkedIn", "https://www.linkedin.com/in/walter-gomez-fullstack-developer-datascience-businessintelligence-finanzas-python/")  #,use_container_width=False
-    with right: 
-        #st.write('##') 
-        st.link_button("Mi Porfolio", "https://walter-portfolio-animado.netlify.app/") # , use_container_width=False
-    
\ No newline at end of file
+# Exportación de las transacciones sin agregar: se leen y escriben por lotes, sin armar el archivo en memoria.
+# Las exportaciones grandes se descargan por streaming desde la API en lugar de pasar por la página
+with st.container(border=True):
+    st.markdown("**Exportar transacciones**")
+    c1,c2 = st.columns([0.6,0.4])
+    with c1:
+        rango = st.date_input("Rango de fechas", value=(date(parAno,1,1), date(parAno,parMes,calendar.monthrange(parAno,parMes)[1])), key="rango_exportacion")
+    with c2:
+        formatoExp = st.radio("Formato", ["csv","parquet"], horizontal=True, key="formato_exportacion")
+    if st.button("Preparar exportación", icon=":material/download:", key="preparar_exportacion"):
+        if len(rango) != 2:
+            st.warning("Elegí la fecha inicial y la final del rango")
+        else:
+            desde, hasta = rango
+            filtrosExp = filtros_transacciones(desde, hasta, parPais)
+            # Pedidos simultáneos o repetidos de la misma exportación comparten un único archivo
+            with st.spinner("Exportando transacciones..."), medir('exportar_transacciones'):
+                ruta = archivo_exportacion(("transacciones", filtrosExp, formatoExp, version_fuente()), formatoExp,
+                                           lambda: (lotes_filas(filtrosExp), esquema_filas()))
+            tamanoMb = os.path.getsize(ruta) / 2**20
+            if tamanoMb <= DESCARGA_MAX_MB:
+                with open(ruta, "rb") as archivo:
+                    st.download_button(
+                        label=f"Descargar {formatoExp.upper()}",
+                        data=archivo,
+                        file_name=f"transacciones_{desde}_{hasta}.{formatoExp}",
+                        mime=FORMATOS[formatoExp],
+                        key="descargar_exportacion"
+                    )
+            else:
+                st.warning(f"La exportación ocupa {tamanoMb:,.0f} MB, más que el límite de descarga desde la página ({DESCARGA_MAX_MB:,.0f} MB).")
+                url = url_transacciones(desde, hasta, parPais, formatoExp)
+                if url:
+                    st.link_button("Descargar desde la API (streaming)", url, icon=":material/download:")
+                else:
+                    st.caption("Para descargarla por streaming levantá la API local (`python -m comun.api`) y definí API_URL.")
+
+panel_mediciones()
+panel_cache()
+panel_memoria()
+pie_de_pagina()
@@ -1,43 +1,31 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from xgboost import XGBRegressor
-from tabpfn import TabPFNRegressor
 from sklearn.metrics import mean_absolute_error
 import warnings
+from comun.cache import panel_cache
+from comun.consultas import valores_distintos
+from comun.estilo import aplicar_estilo, pie_de_pagina
+from comun.jerarquia import JERARQUIAS, METODOS, hijos, pronostico_jerarquico
+from comun.medicion import iniciar_rerun, medido, medir, panel_mediciones
+from comun.memoria import panel_memoria
+from comun.pronosticos import entrenar_mensual, leer_mensual, serie_mensual
 warnings.simplefilter("ignore", category=FutureWarning)
 # Suprimir advertencias ValueWarning
 warnings.simplefilter("ignore")
 
 st.set_page_config(page_title="Predicción Ventas con TabPFN-XGBoost", layout="wide" , page_icon=":material/monitoring:")
 
-def apply_custom_style():
-    css_file = "asset/styles.css"
-    try:
-        with open(css_file) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    except FileNotFoundError:
-        st.error(f"No se encontró el archivo de estilo: {css_file}", icon=":material/cancel:")
-apply_custom_style()
+aplicar_estilo()
+iniciar_rerun("prediccion")
 
 st.subheader("Predicción con TabPFN y XGBoost")
 st.caption("Visualización interactiva de predicciones futuras")
 
-# Cargar datos
-@st.cache_data
-def cargar_datos():
-    df = pd.read_excel("datos/db-datos.xlsx")
-    df["fecha"] = pd.to_datetime(df["fecha"])
-    return df[["fecha", "pais", "categoria", "total"]]
-
-df = cargar_datos()
-
 # Sidebar
 modo = st.sidebar.radio("Seleccioná el escenario", ["Por país", "Por categoría"])
 horizonte = st.sidebar.selectbox("Horizonte de predicción (meses)", [2, 3, 6])
 columna_filtro = "pais" if modo == "Por país" else "categoria"
-opciones = df[columna_filtro].dropna().unique()
+opciones = valores_distintos(columna_filtro)
 seleccion = st.sidebar.selectbox(f"Seleccioná un {columna_filtro}:", opciones)
 
 # Comparación múltiple
@@ -50,53 +38,25 @@ if comparar:
     )
 
 # Función de preparación
-def preparar_datos(df, filtro, columna):
-    df_filtrado = df[df[columna] == filtro]
-    df_ag = (
-        df_filtrado.groupby(pd.Grouper(key="fecha", freq="MS"))["total"]
-        .sum()
-        .reset_index()
-        .rename(columns={"fecha": "Date", "total": "Value"})
-        .set_index("Date")
-        .sort_index()
-    )
-    df_ag["month"] = df_ag.index.month
-    df_ag["run_idx"] = np.arange(len(df_ag)) / len(df_ag)
-    return df_ag
+@medido()
+def preparar_datos(filtro, columna):
+    return serie_mensual(filtro, columna)
 
-# Entrenamiento y predicción
+# Entrenamiento y predicción: se usa el resultado precalculado si existe para esta versión de datos
+@medido()
 def entrenar_y_predecir(df_model, nombre, horiz):
     if len(df_model) < horiz + 4:
         st.warning(f"No hay suficientes datos para: {nombre}")
         return None
-    
-    train, test = df_model.iloc[:-horiz], df_model.iloc[-horiz:]
-    X_tr, y_tr = train.drop(columns="Value"), train["Value"]
-    X_te, y_te = test.drop(columns="Value"), test["Value"]
-
-    # Modelos
-    xgb = XGBRegressor()
-    xgb.fit(X_tr, y_tr)
-    y_xgb = xgb.predict(X_te)
-
-    tab = TabPFNRegressor(device="cpu", ignore_pretraining_limits=True)
-    tab.fit(X_tr.values, y_tr.values)
-    y_tab = tab.predict(X_te.values, output_type="median")
-    q10, q90 = tab.predict(X_te.values, output_type="quantiles", quantiles=[0.1, 0.9])
-
-    return {
-        "nombre": nombre,
-        "index": df_model.index,
-        "valores": df_model["Value"],
-        "fechas_pred": y_te.index,
-        "tab_median": y_tab,
-        "tab_q10": q10,
-        "tab_q90": q90,
-        "xgb": y_xgb,
-        "y_te": y_te
-    }
+
+    with medir("almacen_pronosticos"):
+        guardado = leer_mensual(columna_filtro, nombre, horiz)
+    if guardado is not None:
+        return {"nombre": nombre, "index": df_model.index, "valores": df_model["Value"], **guardado}
+    return entrenar_mensual(df_model, nombre, horiz, columna_filtro)
 
 # Gráfico con Plotly
+@medido()
 def graficar_resultado(resultado):
     if resultado is None:
         return
@@ -147,7 +107,7 @@ def graficar_resultado(resultado):
     st.plotly_chart(fig, use_container_width=True)
 
 # Ejecutar
-df_modelo = preparar_datos(df, seleccion, columna_filtro)
+df_modelo = preparar_datos(seleccion, columna_filtro)
 res_principal = entrenar_y_predecir(df_modelo, seleccion, horizonte)
 graficar_resultado(res_principal)
 
@@ -155,21 +115,52 @@ graficar_resultado(res_principal)
 if comparar and opciones_comparar:
     st.markdown("**Comparaciones adicionales**")
     for adicional in opciones_comparar:
-        df_comp = preparar_datos(df, adicional, columna_filtro)
+        df_comp = preparar_datos(adicional, columna_filtro)
         resultado = entrenar_y_predecir(df_comp, adicional, horizonte)
         graficar_resultado(resultado)
 
-# --------------- footer -----------------------------
-st.write("---")
-with st.container():
-    #st.write("---")
-    st.write("&copy; - derechos reservados -  2025 -  Walter Gómez - FullStack Developer - Data Science - Business Intelligence")
-    #st.write("##")
-    left, right = st.columns(2, gap='medium', vertical_alignment="bottom")
-    with left:
-        #st.write('##')
-        st.link_button("Mi LinkedIn", "https://www.linkedin.com/in/walter-gomez-fullstack-developer-datascience-businessintelligence-finanzas-python/")  #,use_container_width=False
-    with right: 
-        #st.write('##') 
-        st.link_button("Mi Porfolio", "https://walter-portfolio-animado.netlify.app/") # , use_container_width=False
-    
\ No newline at end of file
+# Pronóstico jerárquico: todos los niveles del árbol, conciliados para que los hijos sumen el padre
+@medido()
+def graficar_jerarquia(arbol, nodo):
+    historia, base, conciliado = arbol["historia"][nodo], arbol["base"][nodo], arbol["conciliado"][nodo]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=historia.index, y=historia, mode="lines+markers", name="Histórico", line=dict(color="blue")))
+    fig.add_trace(go.Scatter(x=base.index, y=base, mode="lines+markers", name="XGBoost base", line=dict(color="orange", dash="dot")))
+    fig.add_trace(go.Scatter(x=conciliado.index, y=conciliado, mode="lines+markers", name="Conciliado", line=dict(color="green", dash="dash")))
+    fig.update_layout(
+        title=f"Predicción {horizonte} meses — {nodo}",
+        xaxis_title="Fecha",
+        yaxis_title="Total",
+        hovermode="x unified",
+        legend=dict(x=0, y=1),
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.write(f"**MAE base**: {(base - historia.loc[base.index]).abs().mean():,.2f} — "
+             f"**MAE conciliado**: {(conciliado - historia.loc[conciliado.index]).abs().mean():,.2f}")
+
+    nodos_hijos = hijos(arbol, nodo)
+    if nodos_hijos:
+        tabla = arbol["conciliado"][nodos_hijos].T
+        tabla.columns = tabla.columns.strftime("%Y-%m")
+        st.markdown(f"**Pronóstico conciliado de los hijos de {nodo}** (la suma coincide con el nodo)")
+        st.dataframe(tabla, use_container_width=True)
+
+st.markdown("---")
+if st.checkbox("Pronóstico jerárquico (país → ciudad, categoría → producto)", key="jerarquico"):
+    col_arbol, col_metodo = st.columns(2)
+    with col_arbol:
+        padre = st.selectbox("Jerarquía", list(JERARQUIAS), format_func=lambda p: f"{p} → {JERARQUIAS[p]}")
+    with col_metodo:
+        metodo = st.radio("Conciliación", list(METODOS), format_func=METODOS.get, horizontal=True)
+    with st.spinner("Entrenando el modelo global de la jerarquía..."):
+        arbol = pronostico_jerarquico(padre, horizonte, metodo)
+    nodo = st.selectbox("Nodo", arbol["nombres"])
+    graficar_jerarquia(arbol, nodo)
+
+panel_mediciones()
+panel_cache()
+panel_memoria()
+pie_de_pagina()
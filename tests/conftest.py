@@ -0,0 +1,20 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+os.environ.setdefault("PRECALENTAR_MODELOS", "0")
+
+from tests import stubs  # noqa: E402
+
+
+@pytest.fixture
+def modelos_stub(monkeypatch):
+    """Reemplaza xgboost, tabpfn y darts por modelos triviales para medir solo el dashboard."""
+    from comun import modelos
+
+    monkeypatch.setattr(modelos, "cargar_modelo", stubs.cargar_modelo)
+    monkeypatch.chdir(RAIZ)
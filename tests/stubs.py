@@ -0,0 +1,67 @@
+"""Sustitutos rápidos de los modelos pesados para los tests de latencia."""
+import numpy as np
+import pandas as pd
+
+
+class RegresorMedia:
+    """Predice la media de entrenamiento; acepta la interfaz de XGBRegressor y TabPFNRegressor."""
+
+    def __init__(self, *args, **kwargs):
+        self.media_ = 0.0
+
+    def fit(self, X, y):
+        self.media_ = float(np.mean(y))
+        return self
+
+    def predict(self, X, output_type="mean", quantiles=None):
+        base = np.full(len(X), self.media_)
+        if output_type == "quantiles":
+            return [base * 0.9, base * 1.1]
+        return base
+
+
+class SerieStub:
+    """Lo mínimo de darts.TimeSeries que usa la página N-BEATS."""
+
+    def __init__(self, serie):
+        self._serie = serie
+
+    @classmethod
+    def from_dataframe(cls, df, time_col, value_cols, fill_missing_dates=True, freq=None):
+        serie = df.set_index(time_col)[value_cols].astype(float)
+        return cls(serie.asfreq(freq, fill_value=0.0) if fill_missing_dates else serie)
+
+    @property
+    def time_index(self):
+        return self._serie.index
+
+    def values(self):
+        return self._serie.to_numpy().reshape(-1, 1)
+
+
+class NBeatsStub:
+    """Repite el último valor observado como pronóstico."""
+
+    def __init__(self, **kwargs):
+        self.serie = None
+
+    def fit(self, serie):
+        self.serie = serie
+        return self
+
+    def predict(self, n):
+        indice = self.serie.time_index
+        futuro = pd.date_range(indice[-1], periods=n + 1, freq=indice.freq)[1:]
+        return SerieStub(pd.Series(np.repeat(self.serie.values()[-1, 0], n), index=futuro))
+
+
+REGISTRO = {
+    "xgboost": RegresorMedia,
+    "tabpfn": RegresorMedia,
+    "nbeats": NBeatsStub,
+    "timeseries": SerieStub,
+}
+
+
+def cargar_modelo(nombre):
+    return REGISTRO[nombre]
@@ -0,0 +1,34 @@
+"""Validación de parámetros de la API local (las respuestas 4xx no calculan nada)."""
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from comun.api import app  # noqa: E402
+
+
+@pytest.fixture
+def cliente():
+    return TestClient(app)
+
+
+def test_sankey_rechaza_origen_igual_a_destino(cliente):
+    respuesta = cliente.get("/sankey/pais/pais")
+
+    assert respuesta.status_code == 400
+    assert "distintas" in respuesta.text
+
+
+def test_sankey_rechaza_dimension_desconocida(cliente):
+    assert cliente.get("/sankey/pais/color").status_code == 400
+
+
+def test_sankey_rechaza_mes_no_entero(cliente):
+    assert cliente.get("/sankey/pais/producto", params={"mes": "mayo"}).status_code == 400
+
+
+def test_transacciones_rechaza_fecha_invalida(cliente):
+    respuesta = cliente.get("/transacciones", params={"desde": "2024-13-01", "hasta": "2024-12-31"})
+    assert respuesta.status_code == 400
@@ -0,0 +1,72 @@
+"""Caché de resultados compartida: presupuesto con desalojo LRU y vencimiento por TTL."""
+import types
+
+import numpy as np
+import pytest
+
+from comun import cache
+from comun.cache import CacheResultados, tamano
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj manual para el vencimiento por TTL."""
+    ahora = [0.0]
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(monotonic=lambda: ahora[0]))
+    return ahora
+
+
+def bloque():
+    return np.zeros(1000)  # 8000 bytes
+
+
+def test_desaloja_el_menos_usado():
+    c = CacheResultados(presupuesto_bytes=2 * tamano(bloque()), ttl=60)
+    c.guardar("a", bloque())
+    c.guardar("b", bloque())
+    assert c.obtener("a")[0]  # "a" pasa a ser la más reciente
+
+    c.guardar("c", bloque())
+
+    assert c.obtener("b") == (False, None)
+    assert c.obtener("a")[0] and c.obtener("c")[0]
+    assert c.estadisticas()["desalojos (LRU)"] == 1
+    assert c.estadisticas()["entradas"] == 2
+
+
+def test_no_guarda_valores_mayores_al_presupuesto():
+    c = CacheResultados(presupuesto_bytes=tamano(bloque()) // 2, ttl=60)
+    c.guardar("a", bloque())
+
+    assert c.obtener("a") == (False, None)
+    assert c.estadisticas()["MB usados"] == 0
+
+
+def test_vence_por_ttl(reloj):
+    c = CacheResultados(presupuesto_bytes=10**6, ttl=10)
+    c.guardar("a", 1)
+
+    reloj[0] = 9
+    assert c.obtener("a") == (True, 1)
+    reloj[0] = 11
+    assert c.obtener("a") == (False, None)
+    assert c.estadisticas()["vencidas (TTL)"] == 1
+    assert c.estadisticas()["entradas"] == 0
+
+
+def test_cacheado_calcula_una_vez_por_argumentos(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE", CacheResultados(10**6, 60))
+    monkeypatch.setattr(cache, "_version_actual", lambda: ("pandas", "v1"))
+    llamadas = []
+
+    @cache.cacheado("tests", "doble")
+    def doble(x):
+        llamadas.append(x)
+        return 2 * x
+
+    assert [doble(1), doble(1), doble(2)] == [2, 2, 4]
+    assert llamadas == [1, 2]
+
+    monkeypatch.setattr(cache, "_version_actual", lambda: ("pandas", "v2"))
+    doble(1)
+    assert llamadas == [1, 2, 1]  # una nueva versión de datos invalida el resultado
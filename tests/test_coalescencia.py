@@ -0,0 +1,78 @@
+"""Coalescencia: llamadas concurrentes con la misma clave comparten un único cálculo."""
+import threading
+import time
+
+import pytest
+
+from comun.coalescencia import CONTADORES, compartir
+
+
+def esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "tiempo de espera agotado"
+        time.sleep(0.01)
+
+
+def concurrentes(clave, funcion, cantidad=5):
+    """Lanza `cantidad` llamadas a `compartir` mientras la primera sigue en curso."""
+    iniciado, liberar = threading.Event(), threading.Event()
+    resultados, errores = [], []
+
+    def calculo():
+        iniciado.set()
+        liberar.wait(5)
+        return funcion()
+
+    def llamar():
+        try:
+            resultados.append(compartir(clave, calculo))
+        except Exception as e:
+            errores.append(e)
+
+    compartidas = CONTADORES["compartidas"]
+    hilos = [threading.Thread(target=llamar) for _ in range(cantidad)]
+    hilos[0].start()
+    iniciado.wait(5)
+    for hilo in hilos[1:]:
+        hilo.start()
+    esperar(lambda: CONTADORES["compartidas"] - compartidas == cantidad - 1)
+    liberar.set()
+    for hilo in hilos:
+        hilo.join(5)
+    return resultados, errores
+
+
+def test_un_solo_calculo_para_llamadas_concurrentes():
+    ejecuciones = []
+
+    def funcion():
+        ejecuciones.append(1)
+        return object()
+
+    resultados, errores = concurrentes(("test", "mismo"), funcion)
+
+    assert not errores
+    assert len(ejecuciones) == 1
+    assert len(resultados) == 5 and all(r is resultados[0] for r in resultados)
+
+
+def test_la_excepcion_llega_a_todas_las_llamadas():
+    def funcion():
+        raise ValueError("falló")
+
+    resultados, errores = concurrentes(("test", "error"), funcion)
+
+    assert not resultados
+    assert len(errores) == 5 and all(isinstance(e, ValueError) for e in errores)
+
+
+def test_terminado_el_calculo_la_clave_se_libera():
+    assert compartir(("test", "secuencial"), lambda: 1) == 1
+    assert compartir(("test", "secuencial"), lambda: 2) == 2
+
+
+def test_un_error_no_deja_la_clave_tomada():
+    with pytest.raises(KeyError):
+        compartir(("test", "a"), lambda: {}["x"])
+    assert compartir(("test", "a"), lambda: "a") == "a"
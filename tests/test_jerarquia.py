@@ -0,0 +1,55 @@
+"""Coherencia de la conciliación jerárquica: los hijos suman el padre con cada método."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from comun.jerarquia import METODOS, conciliar, matriz_suma
+
+# Total → A (a1, a2), B (b1, b2, b3)
+PADRES_HOJA = pd.Index(["A", "A", "B", "B", "B"])
+PADRES = pd.Index(["A", "B"])
+
+
+@pytest.fixture
+def S():
+    return matriz_suma(PADRES_HOJA, PADRES)
+
+
+def test_matriz_suma(S):
+    esperada = np.array([
+        [1, 1, 1, 1, 1],
+        [1, 1, 0, 0, 0],
+        [0, 0, 1, 1, 1],
+        *np.eye(5),
+    ])
+    np.testing.assert_array_equal(S.toarray(), esperada)
+
+
+@pytest.mark.parametrize("metodo", list(METODOS))
+def test_conciliado_es_coherente(S, metodo):
+    rng = np.random.default_rng(0)
+    base = rng.uniform(50, 150, size=(4, S.shape[0]))  # pronósticos base incoherentes
+    varianza = rng.uniform(1, 10, size=S.shape[0])
+
+    conciliado = conciliar(S, base, metodo, varianza)
+
+    assert conciliado.shape == base.shape
+    hojas = conciliado[:, -S.shape[1]:]
+    np.testing.assert_allclose(conciliado, (S @ hojas.T).T, rtol=1e-6)
+
+
+@pytest.mark.parametrize("metodo", list(METODOS))
+def test_base_coherente_no_cambia(S, metodo):
+    hojas = np.random.default_rng(1).uniform(10, 100, size=(3, S.shape[1]))
+    base = (S @ hojas.T).T
+
+    np.testing.assert_allclose(conciliar(S, base, metodo, np.ones(S.shape[0])), base, rtol=1e-4)
+
+
+def test_bottom_up_usa_solo_las_hojas(S):
+    base = np.random.default_rng(2).uniform(10, 100, size=(2, S.shape[0]))
+
+    conciliado = conciliar(S, base, "bottom_up")
+
+    np.testing.assert_array_equal(conciliado[:, -S.shape[1]:], base[:, -S.shape[1]:])
+    np.testing.assert_allclose(conciliado[:, 0], base[:, -S.shape[1]:].sum(axis=1))
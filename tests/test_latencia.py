@@ -0,0 +1,122 @@
+"""Latencia de rerun de cada página con AppTest e interacciones guionadas.
+
+Cada página se ejecuta una vez en frío (llena las cachés) y luego se mide el tiempo
+de los reruns que disparan las interacciones. Los presupuestos son para reruns en
+caliente con los modelos sustituidos por stubs; LATENCIA_FACTOR los escala para
+máquinas más lentas (p. ej. CI) y LATENCIA_REPETICIONES fija la cantidad de reruns.
+"""
+import os
+import statistics
+import time
+
+import numpy as np
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from comun.kpis import COMPARACIONES
+from tests.conftest import RAIZ
+
+REPETICIONES = int(os.environ.get("LATENCIA_REPETICIONES", 12))
+FACTOR = float(os.environ.get("LATENCIA_FACTOR", 1.0))
+
+# Presupuesto en segundos: (p50, p95)
+PRESUPUESTOS = {
+    "Inicio.py": (0.5, 1.0),
+    "pages/1-Analisis.py": (1.0, 2.0),
+    "pages/2-Prediccion.py": (1.5, 3.0),
+    "pages/3-N-beats.py": (1.0, 2.5),
+    "pages/4-Sankey.py": (1.5, 3.0),
+}
+
+
+def alternar(casilla):
+    return casilla.set_value(not casilla.value)
+
+
+def siguiente_opcion(selector):
+    indice = (selector.index + 1) % len(selector.options)
+    if hasattr(selector, "select_index"):
+        return selector.select_index(indice)
+    return selector.set_value(selector.options[indice])  # radio con opciones de texto
+
+
+def cambiar_pais(at):
+    paises = at.sidebar.multiselect[0]
+    pendientes = [p for p in paises.options if p not in paises.value]
+    return paises.select(pendientes[0]) if pendientes else paises.set_value([])
+
+
+def siguiente_comparacion(at):
+    radio = at.sidebar.radio(key="comparacion")
+    modos = list(COMPARACIONES)
+    return radio.set_value(modos[(modos.index(radio.value) + 1) % len(modos)])
+
+
+def quitar_primero(selector):
+    return selector.set_value(selector.value[1:] or selector.options)
+
+
+INTERACCIONES = {
+    "Inicio.py": [
+        lambda at: at,
+    ],
+    "pages/1-Analisis.py": [
+        lambda at: siguiente_opcion(at.sidebar.selectbox[1]),  # mes
+        cambiar_pais,
+        lambda at: siguiente_opcion(at.sidebar.selectbox[0]),  # año
+        siguiente_comparacion,
+    ],
+    "pages/2-Prediccion.py": [
+        lambda at: siguiente_opcion(at.sidebar.selectbox[1]),  # país o categoría
+        lambda at: siguiente_opcion(at.sidebar.selectbox[0]),  # horizonte
+        lambda at: alternar(at.sidebar.checkbox[0]),  # comparación múltiple
+    ],
+    "pages/3-N-beats.py": [
+        lambda at: siguiente_opcion(at.main.selectbox[0]),  # entidad
+        lambda at: at.button(key="entrenar").click(),
+        lambda at: alternar(at.main.checkbox[-1]),  # comparación múltiple
+        lambda at: siguiente_opcion(at.sidebar.selectbox[0]),  # fecha / mes
+    ],
+    "pages/4-Sankey.py": [
+        lambda at: alternar(at.toggle(key="ver_vista_previa")),
+        lambda at: quitar_primero(at.multiselect(key="paises_1")),
+        lambda at: siguiente_opcion(at.radio(key="formato_uno")),
+    ],
+}
+
+
+def percentil(tiempos, q):
+    return float(np.percentile(tiempos, q))
+
+
+@pytest.fixture(params=["pandas", "duckdb"])
+def motor(request, monkeypatch):
+    """Corre cada página con los dos backends de consultas."""
+    if request.param == "duckdb":
+        pytest.importorskip("duckdb")
+    from comun import consultas
+
+    monkeypatch.setattr(consultas, "BACKEND", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("pagina", list(PRESUPUESTOS))
+def test_latencia_rerun(pagina, motor, modelos_stub):
+    at = AppTest.from_file(str(RAIZ / pagina), default_timeout=120)
+    at.run()
+    assert not at.exception, at.exception
+
+    tiempos = []
+    interacciones = INTERACCIONES[pagina]
+    for i in range(REPETICIONES):
+        elemento = interacciones[i % len(interacciones)](at)
+        inicio = time.perf_counter()
+        elemento.run()
+        tiempos.append(time.perf_counter() - inicio)
+        assert not at.exception, f"{pagina}, interacción {i % len(interacciones)}: {at.exception}"
+
+    p50, p95 = statistics.median(tiempos), percentil(tiempos, 95)
+    presupuesto_p50, presupuesto_p95 = (limite * FACTOR for limite in PRESUPUESTOS[pagina])
+    print(f"{pagina} [{motor}]: p50={p50:.3f}s p95={p95:.3f}s ({REPETICIONES} reruns)")
+    assert p50 <= presupuesto_p50, f"{pagina}: p50 {p50:.3f}s supera el presupuesto de {presupuesto_p50:.2f}s"
+    assert p95 <= presupuesto_p95, f"{pagina}: p95 {p95:.3f}s supera el presupuesto de {presupuesto_p95:.2f}s"
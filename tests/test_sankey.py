@@ -0,0 +1,40 @@
+"""Poda de enlaces del Sankey: tamaño acotado y totales por origen conservados."""
+import pandas as pd
+import pytest
+
+from comun.sankey import podar_enlaces
+
+
+@pytest.fixture
+def enlaces():
+    return pd.DataFrame({
+        "pais": ["Chile"] * 5 + ["Perú"] * 2,
+        "producto": ["a", "b", "c", "d", "e", "a", "b"],
+        "total": [50.0, 30.0, 10.0, 6.0, 4.0, 70.0, 30.0],
+    })
+
+
+def totales(df):
+    return df.groupby("pais")["total"].sum()
+
+
+def test_top_n_agrupa_el_resto_en_otros(enlaces):
+    podado = podar_enlaces(enlaces, "pais", "producto", "total", top_n=2)
+
+    chile = podado[podado["pais"] == "Chile"].set_index("producto")["total"]
+    assert chile.to_dict() == {"a": 50.0, "b": 30.0, "Otros": 20.0}
+    assert "Otros" not in podado.loc[podado["pais"] == "Perú", "producto"].tolist()
+    pd.testing.assert_series_equal(totales(podado), totales(enlaces))
+
+
+def test_cuota_conserva_los_enlaces_que_la_cubren(enlaces):
+    podado = podar_enlaces(enlaces, "pais", "producto", "total", cuota=0.8)
+
+    chile = podado[podado["pais"] == "Chile"].set_index("producto")["total"]
+    assert chile.to_dict() == {"a": 50.0, "b": 30.0, "Otros": 20.0}
+    pd.testing.assert_series_equal(totales(podado), totales(enlaces))
+
+
+def test_sin_limites_devuelve_la_tabla_original(enlaces):
+    assert podar_enlaces(enlaces, "pais", "producto", "total") is enlaces
+    assert podar_enlaces(enlaces, "pais", "producto", "total", top_n=10) is enlaces
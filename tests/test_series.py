@@ -0,0 +1,59 @@
+"""Reducción de puntos de las series: cantidad, extremos y picos conservados."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from comun.series import UMBRAL_WEBGL, lttb, minmax, reducir, trazo_linea
+
+
+@pytest.fixture
+def serie():
+    x = pd.date_range("2020-01-01", periods=10_000, freq="h").to_numpy()
+    y = np.sin(np.linspace(0, 40, 10_000))
+    y[5_432] = 25.0  # pico aislado
+    return x, y
+
+
+@pytest.mark.parametrize("n", [3, 100, 1_000])
+def test_lttb_devuelve_n_puntos_ordenados(serie, n):
+    x, y = serie
+    indices = lttb(x, y, n)
+
+    assert len(indices) == n
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_conserva_el_pico(serie):
+    x, y = serie
+    assert 5_432 in lttb(x, y, 500)
+
+
+def test_minmax_conserva_extremos_y_no_supera_n(serie):
+    _, y = serie
+    indices = minmax(y, 200)
+
+    assert len(indices) <= 200
+    assert np.all(np.diff(indices) > 0)
+    assert y.argmax() in indices and y.argmin() in indices
+
+
+def test_series_cortas_no_se_reducen():
+    y = np.arange(10.0)
+    np.testing.assert_array_equal(lttb(np.arange(10), y, 50), np.arange(10))
+    np.testing.assert_array_equal(minmax(y, 50), np.arange(10))
+
+
+@pytest.mark.parametrize("metodo", ["lttb", "minmax"])
+def test_reducir_respeta_max_puntos(serie, metodo):
+    x, y = serie
+    xr, yr = reducir(x, y, 1_500, metodo)
+
+    assert len(xr) == len(yr) <= 1_500
+    assert yr.max() == y.max()
+
+
+def test_trazo_linea_usa_webgl_solo_en_series_grandes(serie):
+    x, y = serie
+    assert type(trazo_linea(x, y, max_puntos=500)).__name__ == "Scatter"
+    assert type(trazo_linea(x, y, max_puntos=UMBRAL_WEBGL * 2)).__name__ == "Scattergl"